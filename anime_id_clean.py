@@ -7,29 +7,26 @@ in anime libraries. It identifies anime libraries and cleans up provider IDs
 from movies and TV series that shouldn't have anime-specific metadata.
 """
 
+import json
 import logging
-from typing import List, Set, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from typing import List, Set, FrozenSet, Dict, Any, Optional, Tuple, Iterator, Iterable
+from dataclasses import dataclass, asdict
 from jellyfin_core import (
     JellyfinAPI, MediaLibrary, MediaItem, MediaType, MediaFilter,
-    create_media_library, JellyfinAPIError
+    create_media_library, decode_json, loads_json, JellyfinAPIError
 )
 from vars import JELLYFIN_URL, JELLYFIN_API_KEY, JELLYFIN_USER_ID
 
-# Extend MediaItem to support episode metadata
-def extend_media_item():
-    """Add episode-specific attributes to MediaItem instances"""
-    def add_episode_attrs(self, parent_id=None, series_id=None, 
-                         episode_number=None, season_number=None):
-        self.parent_id = parent_id
-        self.series_id = series_id
-        self.episode_number = episode_number
-        self.season_number = season_number
-    
-    MediaItem.add_episode_attrs = add_episode_attrs
-
-extend_media_item()
-
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +35,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of libraries scanned concurrently
+SCAN_WORKERS = 8
+
+# Number of items requested per page when listing library contents
+PAGE_SIZE = 500
+
+# Scanned items buffered ahead of the updaters before scanners block
+SCAN_QUEUE_SIZE = 256
+
+# On-disk cache of library classifications, keyed by server URL
+LIBRARY_CACHE_FILE = os.path.expanduser("~/.cache/anime_id_clean/libraries.json")
+LIBRARY_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Map Jellyfin item "Type" values to MediaType
+MEDIA_TYPE_BY_NAME = {media_type.value.lower(): media_type for media_type in MediaType}
+
+
+def parse_items_page(content: bytes, required_providers: frozenset) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Decode a page of items and keep those with one of the required providers.
+    
+    Runs in a worker process when page parsing is offloaded, so only the few
+    matching items are sent back rather than the whole decoded page.
+    
+    Args:
+        content: Raw JSON body of an items response
+        required_providers: Provider names of which an item needs at least one
+        
+    Returns:
+        Tuple of (number_of_items_on_page, matching_item_dicts)
+    """
+    items_data = loads_json(content).get("Items", [])
+    return len(items_data), [
+        item_data for item_data in items_data
+        if not required_providers.isdisjoint(item_data.get("ProviderIds") or ())
+    ]
+
+
+@dataclass(slots=True)
+class EpisodeItem(MediaItem):
+    """MediaItem with the episode metadata used to identify an episode"""
+    parent_id: Optional[str] = None  # Season ID
+    series_id: Optional[str] = None
+    episode_number: Optional[int] = None
+    season_number: Optional[int] = None
+
 
 @dataclass
 class LibraryInfo:
@@ -48,7 +91,7 @@ class LibraryInfo:
     is_anime: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class CleanupResult:
     """Result of cleanup operation"""
     total_items_processed: int
@@ -64,10 +107,13 @@ class CleanupResult:
 class AnimeLibraryDetector:
     """Detects which libraries contain anime content"""
     
-    ANIME_KEYWORDS = [
+    ANIME_KEYWORDS = (
         'anime', 'アニメ', 'animation', 'japanese animation',
         'manga', 'otaku', 'crunchyroll', 'funimation'
-    ]
+    )
+    
+    # Single compiled, case-insensitive alternation so each name is scanned once
+    _KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, ANIME_KEYWORDS)), re.IGNORECASE)
     
     @classmethod
     def is_anime_library(cls, library_name: str) -> bool:
@@ -80,27 +126,121 @@ class AnimeLibraryDetector:
         Returns:
             True if library appears to be anime-focused
         """
-        name_lower = library_name.lower()
-        return any(keyword in name_lower for keyword in cls.ANIME_KEYWORDS)
+        return cls._KEYWORD_PATTERN.search(library_name) is not None
 
 
 class AnimeProviderFilter(MediaFilter):
     """Filter for items that have anime-specific provider IDs"""
     
-    ANIME_PROVIDERS = {'AniDB', 'AniList'}
+    ANIME_PROVIDERS = frozenset({'AniDB', 'AniList'})
     
     def should_include(self, media_item: MediaItem) -> bool:
         """Check if media item has anime provider IDs"""
-        return any(provider in media_item.provider_ids 
-                  for provider in self.ANIME_PROVIDERS)
+        return not self.ANIME_PROVIDERS.isdisjoint(media_item.provider_ids)
     
     def get_anime_provider_ids(self, media_item: MediaItem) -> Dict[str, str]:
         """Get anime provider IDs from media item"""
+        provider_ids = media_item.provider_ids
         return {
-            provider: provider_id
-            for provider, provider_id in media_item.provider_ids.items()
-            if provider in self.ANIME_PROVIDERS
+            provider: provider_ids[provider]
+            for provider in self.get_anime_provider_keys(media_item)
         }
+    
+    def get_anime_provider_keys(self, media_item: MediaItem) -> Set[str]:
+        """Get the names of the anime providers set on media item"""
+        return self.ANIME_PROVIDERS & media_item.provider_ids.keys()
+
+
+# Shared filter instance; it holds no per-item state
+ANIME_FILTER = AnimeProviderFilter()
+
+
+class LibraryCache:
+    """Persists the library list and anime classification between runs"""
+    
+    def __init__(self, server_url: str, cache_file: str = LIBRARY_CACHE_FILE,
+                 ttl: float = LIBRARY_CACHE_TTL):
+        """
+        Initialize the library cache.
+        
+        Args:
+            server_url: Jellyfin server URL used as the cache key
+            cache_file: Path of the JSON cache file
+            ttl: Maximum age of cached entries in seconds
+        """
+        self.server_url = server_url.rstrip('/')
+        self.cache_file = cache_file
+        self.ttl = ttl
+    
+    def _load_all(self) -> Dict[str, Any]:
+        """Load every server entry from the cache file"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load library cache: {e}")
+            return {}
+    
+    def _save_all(self, data: Dict[str, Any]) -> None:
+        """Write every server entry to the cache file"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        except IOError as e:
+            logger.warning(f"Failed to save library cache: {e}")
+    
+    def load(self) -> Optional[List[LibraryInfo]]:
+        """
+        Get cached libraries for this server.
+        
+        Returns:
+            List of LibraryInfo objects, or None if missing or older than the TTL
+        """
+        entry = self._load_all().get(self.server_url)
+        if not entry or time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        
+        try:
+            return [LibraryInfo(**lib_data) for lib_data in entry.get('libraries', [])]
+        except TypeError as e:
+            logger.warning(f"Ignoring malformed library cache entry: {e}")
+            return None
+    
+    def save(self, libraries: List[LibraryInfo]) -> None:
+        """Store libraries for this server"""
+        data = self._load_all()
+        entry = data.setdefault(self.server_url, {})
+        
+        # A changed anime classification invalidates the incremental scan checkpoint
+        anime_ids = [lib.id for lib in libraries if lib.is_anime]
+        if entry.get('anime_ids') != anime_ids:
+            entry.pop('last_scan', None)
+        
+        entry.update({
+            'fetched_at': time.time(),
+            'libraries': [asdict(lib) for lib in libraries],
+            'anime_ids': anime_ids
+        })
+        self._save_all(data)
+    
+    def get_last_scan(self) -> Optional[str]:
+        """Get the start time (ISO 8601, UTC) of the last complete cleanup scan"""
+        return self._load_all().get(self.server_url, {}).get('last_scan')
+    
+    def set_last_scan(self, timestamp: str) -> None:
+        """Record the start time of a complete cleanup scan"""
+        data = self._load_all()
+        data.setdefault(self.server_url, {})['last_scan'] = timestamp
+        self._save_all(data)
+    
+    def invalidate(self) -> None:
+        """Drop the cached entry for this server"""
+        data = self._load_all()
+        if data.pop(self.server_url, None) is not None:
+            self._save_all(data)
 
 
 class AnimeProviderCleaner:
@@ -111,32 +251,64 @@ class AnimeProviderCleaner:
     in non-anime libraries, and removes those provider IDs.
     """
     
-    def __init__(self, jellyfin_api: JellyfinAPI):
+    def __init__(self, jellyfin_api: JellyfinAPI, library_cache: Optional[LibraryCache] = None,
+                 parse_processes: int = 0):
         """
         Initialize cleaner with Jellyfin API.
         
         Args:
             jellyfin_api: Configured JellyfinAPI instance
+            library_cache: Optional on-disk cache for the library list
+            parse_processes: Worker processes for decoding library pages (0 decodes in the scanning threads)
         """
         self.api = jellyfin_api
         self.media_library = MediaLibrary(jellyfin_api)
-        self._anime_libraries: Optional[Set[str]] = None
+        self.library_cache = library_cache
+        self.parse_processes = parse_processes
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._anime_libraries: Optional[FrozenSet[str]] = None
+        self._libraries: Optional[List[LibraryInfo]] = None
+        
+        # Set when a library or series listing fails, so an incomplete scan
+        # does not advance the incremental checkpoint
+        self._scan_failed = False
+        
+        # Every request is made on behalf of the primary user; resolve it once
+        # here rather than on each call (and before any worker threads start)
+        self._user_id = self.media_library.primary_user.id
+        self._items_endpoint = f'/Users/{self._user_id}/Items'
     
-    def get_libraries(self) -> List[LibraryInfo]:
+    def get_libraries(self, refresh: bool = False) -> List[LibraryInfo]:
         """
-        Get all libraries from Jellyfin server.
+        Get all libraries from Jellyfin server, caching the result.
         
+        Args:
+            refresh: Ignore the in-memory and on-disk caches and re-fetch the list
+            
         Returns:
             List of LibraryInfo objects
         """
+        if refresh:
+            self._libraries = None
+            self._anime_libraries = None
+        
+        if self._libraries is not None:
+            return self._libraries
+        
+        if self.library_cache is not None and not refresh:
+            cached_libraries = self.library_cache.load()
+            if cached_libraries is not None:
+                logger.info(f"Loaded {len(cached_libraries)} libraries from cache")
+                self._set_libraries(cached_libraries)
+                return cached_libraries
+        
         try:
-            user = self.media_library.primary_user
             response = self.api._make_request(
                 'GET', 
-                f'/Users/{user.id}/Views'
+                f'/Users/{self._user_id}/Views'
             )
             
-            libraries_data = response.json().get('Items', [])
+            libraries_data = decode_json(response).get('Items', [])
             libraries = []
             
             for lib_data in libraries_data:
@@ -149,89 +321,161 @@ class AnimeProviderCleaner:
                 libraries.append(lib_info)
             
             logger.info(f"Found {len(libraries)} libraries")
+            self._set_libraries(libraries)
+            
+            if self.library_cache is not None:
+                self.library_cache.save(libraries)
+            
             return libraries
             
         except JellyfinAPIError as e:
             logger.error(f"Failed to retrieve libraries: {e}")
             return []
     
-    def get_anime_library_ids(self) -> Set[str]:
+    def _set_libraries(self, libraries: List[LibraryInfo]) -> None:
+        """Cache the library list and index its anime library IDs"""
+        self._libraries = libraries
+        self._anime_libraries = frozenset(lib.id for lib in libraries if lib.is_anime)
+        
+        anime_lib_names = [lib.name for lib in libraries if lib.is_anime]
+        logger.info(f"Identified anime libraries: {anime_lib_names}")
+    
+    def get_anime_library_ids(self, refresh: bool = False) -> FrozenSet[str]:
         """
         Get IDs of libraries identified as anime libraries.
         
+        Args:
+            refresh: Re-fetch the library list instead of using the cached one
+            
         Returns:
             Set of anime library IDs
         """
-        if self._anime_libraries is None:
-            libraries = self.get_libraries()
-            self._anime_libraries = {
-                lib.id for lib in libraries if lib.is_anime
-            }
-            
-            anime_lib_names = [lib.name for lib in libraries if lib.is_anime]
-            logger.info(f"Identified anime libraries: {anime_lib_names}")
+        if refresh or self._anime_libraries is None:
+            self.get_libraries(refresh)
         
-        return self._anime_libraries
+        # Still unset if the library list could not be retrieved
+        return self._anime_libraries or frozenset()
     
-    def get_media_items_by_library(self, library_id: str, include_episodes: bool = True) -> List[MediaItem]:
+    def get_media_items_by_library(self, library_id: str, include_episodes: bool = True,
+                                   media_filter: Optional[MediaFilter] = None,
+                                   min_date_last_saved: Optional[str] = None) -> Iterator[MediaItem]:
         """
         Get media items from a specific library.
         
+        All requested media types are fetched with a single paginated query and
+        items are yielded page by page, so only one page is held in memory.
+        
         Args:
             library_id: Library ID to query
             include_episodes: Whether to include individual episodes
+            media_filter: Optional filter to apply to results
+            min_date_last_saved: Only return items saved at or after this ISO 8601 time
             
-        Returns:
-            List of MediaItem objects from the library
+        Yields:
+            MediaItem objects from the library
         """
-        user = self.media_library.primary_user
-        all_items = []
-        
         media_types = [MediaType.MOVIE, MediaType.SERIES]
         if include_episodes:
             media_types.append(MediaType.EPISODE)
         
-        for media_type in media_types:
-            try:
-                params = {
-                    "ParentId": library_id,
-                    "IncludeItemTypes": media_type.value,
-                    "Recursive": "true",
-                    "Fields": "ProviderIds,ParentId,SeriesId"
-                }
-                
-                response = self.api._make_request(
-                    'GET', 
-                    f'/Users/{user.id}/Items', 
-                    params=params
-                )
-                
-                items_data = response.json().get("Items", [])
+        params = {
+            "ParentId": library_id,
+            "IncludeItemTypes": ",".join(media_type.value for media_type in media_types),
+            "Recursive": "true",
+            "Fields": "ProviderIds,ParentId,SeriesId",
+            # Items are updated while later pages are still being fetched, so pages
+            # need an order those updates cannot change, or items could be skipped
+            "SortBy": "DateCreated,SortName",
+            "StartIndex": 0,
+            "Limit": PAGE_SIZE,
+            # Jellyfin cannot filter on provider IDs server-side, so at least skip
+            # the per-page count query and the image/user-data parts of each item
+            "EnableTotalRecordCount": "false",
+            "EnableImages": "false",
+            "EnableUserData": "false"
+        }
+        if min_date_last_saved:
+            params["MinDateLastSaved"] = min_date_last_saved
+        
+        # Anime provider filtering can be decided on the raw item data, so most
+        # items are dropped before a MediaItem is ever built for them
+        required_providers = None
+        if isinstance(media_filter, AnimeProviderFilter):
+            required_providers = media_filter.ANIME_PROVIDERS
+        
+        # Pre-filtered pages can be decoded in worker processes, since only the
+        # matching items have to be sent back
+        parse_pool = self._parse_pool if required_providers is not None else None
+        
+        try:
+            while True:
+                if parse_pool is not None:
+                    response = self.api._make_request('GET', self._items_endpoint, params=params)
+                    page_count, page_items = parse_pool.submit(
+                        parse_items_page, response.content, required_providers
+                    ).result()
+                else:
+                    page_count, page_items = 0, self.api.stream_items(self._items_endpoint, params=params)
                 
-                for item_data in items_data:
-                    media_item = MediaItem(
-                        id=item_data["Id"],
-                        name=item_data.get("Name", "Unknown"),
-                        media_type=media_type,
-                        provider_ids=item_data.get("ProviderIds", {})
-                    )
+                for item_data in page_items:
+                    if parse_pool is None:
+                        page_count += 1
+                        if required_providers is not None and required_providers.isdisjoint(item_data.get("ProviderIds") or ()):
+                            continue
                     
-                    # Add additional metadata for episodes
+                    media_type = MEDIA_TYPE_BY_NAME.get(item_data.get("Type", "").lower())
+                    if media_type is None:
+                        continue
+                    
+                    # Episodes carry additional metadata
                     if media_type == MediaType.EPISODE:
-                        media_item.parent_id = item_data.get("ParentId")
-                        media_item.series_id = item_data.get("SeriesId")
-                        media_item.episode_number = item_data.get("IndexNumber")
-                        media_item.season_number = item_data.get("ParentIndexNumber")
+                        media_item = EpisodeItem(
+                            id=item_data["Id"],
+                            name=item_data.get("Name", "Unknown"),
+                            media_type=media_type,
+                            provider_ids=item_data.get("ProviderIds", {}),
+                            parent_id=item_data.get("ParentId"),
+                            series_id=item_data.get("SeriesId"),
+                            episode_number=item_data.get("IndexNumber"),
+                            season_number=item_data.get("ParentIndexNumber")
+                        )
+                    else:
+                        media_item = MediaItem(
+                            id=item_data["Id"],
+                            name=item_data.get("Name", "Unknown"),
+                            media_type=media_type,
+                            provider_ids=item_data.get("ProviderIds", {})
+                        )
                     
-                    all_items.append(media_item)
+                    # Apply filter if provided, unless it already ran on the raw data above
+                    if media_filter is None or required_providers is not None or media_filter.should_include(media_item):
+                        yield media_item
+                
+                # TotalRecordCount trails the streamed items, so a short page ends the scan
+                params["StartIndex"] += page_count
+                if page_count < PAGE_SIZE:
+                    break
                 
-            except JellyfinAPIError as e:
-                logger.error(f"Failed to get {media_type.value} items from library {library_id}: {e}")
+        except JellyfinAPIError as e:
+            logger.error(f"Failed to get items from library {library_id}: {e}")
+            self._scan_failed = True
+    
+    def _get_libraries_to_scan(self) -> List[LibraryInfo]:
+        """Get the non-anime libraries, logging which libraries are skipped"""
+        libraries_to_scan = []
+        anime_library_ids = self.get_anime_library_ids()
+        
+        for library in self.get_libraries():
+            if library.id in anime_library_ids:
+                logger.info(f"Skipping anime library: {library.name}")
                 continue
+            
+            logger.info(f"Checking library: {library.name}")
+            libraries_to_scan.append(library)
         
-        return all_items
+        return libraries_to_scan
     
-    def get_episodes_for_series(self, series_id: str) -> List[MediaItem]:
+    def get_episodes_for_series(self, series_id: str) -> List[EpisodeItem]:
         """
         Get all episodes for a specific TV series.
         
@@ -239,185 +483,315 @@ class AnimeProviderCleaner:
             series_id: Series ID to get episodes for
             
         Returns:
-            List of episode MediaItem objects
+            List of EpisodeItem objects
         """
-        user = self.media_library.primary_user
         episodes = []
         
+        params = {
+            "ParentId": series_id,
+            "IncludeItemTypes": "Episode",
+            "Recursive": "true",
+            "Fields": "ProviderIds,ParentId,SeriesId,IndexNumber,ParentIndexNumber",
+            "SortBy": "DateCreated,SortName",
+            "StartIndex": 0,
+            "Limit": PAGE_SIZE,
+            "EnableTotalRecordCount": "false",
+            "EnableImages": "false",
+            "EnableUserData": "false"
+        }
+        
         try:
-            params = {
-                "ParentId": series_id,
-                "IncludeItemTypes": "Episode",
-                "Recursive": "true",
-                "Fields": "ProviderIds,ParentId,SeriesId,IndexNumber,ParentIndexNumber"
-            }
-            
-            response = self.api._make_request(
-                'GET', 
-                f'/Users/{user.id}/Items', 
-                params=params
-            )
-            
-            items_data = response.json().get("Items", [])
-            
-            for item_data in items_data:
-                episode = MediaItem(
-                    id=item_data["Id"],
-                    name=item_data.get("Name", "Unknown"),
-                    media_type=MediaType.EPISODE,
-                    provider_ids=item_data.get("ProviderIds", {})
-                )
+            while True:
+                page_count = 0
                 
-                # Add episode-specific metadata
-                episode.parent_id = item_data.get("ParentId")  # Season ID
-                episode.series_id = item_data.get("SeriesId")
-                episode.episode_number = item_data.get("IndexNumber")
-                episode.season_number = item_data.get("ParentIndexNumber")
+                for item_data in self.api.stream_items(self._items_endpoint, params=params):
+                    page_count += 1
+                    episodes.append(EpisodeItem(
+                        id=item_data["Id"],
+                        name=item_data.get("Name", "Unknown"),
+                        media_type=MediaType.EPISODE,
+                        provider_ids=item_data.get("ProviderIds", {}),
+                        parent_id=item_data.get("ParentId"),
+                        series_id=item_data.get("SeriesId"),
+                        episode_number=item_data.get("IndexNumber"),
+                        season_number=item_data.get("ParentIndexNumber")
+                    ))
                 
-                episodes.append(episode)
+                # Same short-page termination as get_media_items_by_library
+                params["StartIndex"] += page_count
+                if page_count < PAGE_SIZE:
+                    break
                 
         except JellyfinAPIError as e:
             logger.error(f"Failed to get episodes for series {series_id}: {e}")
+            self._scan_failed = True
         
         return episodes
     
-    def get_non_anime_items_with_anime_providers(self) -> List[MediaItem]:
+    def get_non_anime_items_with_anime_providers(self, include_episodes: bool = True,
+                                                 min_date_last_saved: Optional[str] = None) -> List[MediaItem]:
         """
         Get media items from non-anime libraries that have anime provider IDs.
         
+        Args:
+            include_episodes: Whether to include individual episodes
+            min_date_last_saved: Only consider items saved at or after this ISO 8601 time
+            
         Returns:
             List of MediaItem objects that need cleaning
         """
-        anime_library_ids = self.get_anime_library_ids()
-        libraries = self.get_libraries()
-        anime_filter = AnimeProviderFilter()
+        return list(self.iter_non_anime_items_with_anime_providers(include_episodes, min_date_last_saved))
+    
+    def iter_non_anime_items_with_anime_providers(self, include_episodes: bool = True,
+                                                  min_date_last_saved: Optional[str] = None
+                                                  ) -> Iterator[MediaItem]:
+        """
+        Stream media items from non-anime libraries that have anime provider IDs.
         
-        items_to_clean = []
+        Libraries are scanned concurrently into a bounded queue, so items are
+        yielded while the scan is still running and the scanners pause when
+        the consumer falls behind.
         
-        for library in libraries:
-            if library.is_anime:
-                logger.info(f"Skipping anime library: {library.name}")
-                continue
-            
-            logger.info(f"Checking library: {library.name}")
-            library_items = self.get_media_items_by_library(library.id)
-            
-            # Filter items that have anime provider IDs
-            anime_provider_items = [
-                item for item in library_items 
-                if anime_filter.should_include(item)
-            ]
+        Args:
+            include_episodes: Whether to include individual episodes
+            min_date_last_saved: Only consider items saved at or after this ISO 8601 time
             
-            if anime_provider_items:
-                logger.info(f"Found {len(anime_provider_items)} items with anime provider IDs in {library.name}")
-                items_to_clean.extend(anime_provider_items)
+        Yields:
+            MediaItem objects that need cleaning, each item once
+        """
+        libraries_to_scan = self._get_libraries_to_scan()
+        if not libraries_to_scan:
+            return
+        
+        # (library, item) pairs; an item of None marks the end of a library
+        scanned: queue.Queue = queue.Queue(maxsize=SCAN_QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def put(entry: Tuple[LibraryInfo, Optional[MediaItem]]) -> bool:
+            # Give up once the consumer has gone away instead of blocking forever
+            while not stop.is_set():
+                try:
+                    scanned.put(entry, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def scan_library(library: LibraryInfo) -> None:
+            try:
+                # Only items with anime provider IDs are kept while paging through libraries
+                for item in self.get_media_items_by_library(
+                    library.id, include_episodes, ANIME_FILTER, min_date_last_saved
+                ):
+                    if not put((library, item)):
+                        return
+            except Exception:
+                # Nothing reads the scanner futures, so the error is reported here
+                logger.exception(f"Scanning library {library.name} failed")
+                self._scan_failed = True
+            finally:
+                put((library, None))
+        
+        # Keyed by item ID so items shared between libraries are cleaned once
+        seen: Set[str] = set()
+        found_by_library = {library.id: 0 for library in libraries_to_scan}
         
-        return items_to_clean
+        # Spawned rather than forked, as the scanning and update threads may already be running
+        if self.parse_processes:
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_processes, mp_context=multiprocessing.get_context('spawn')
+            )
+        
+        try:
+            with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+                for library in libraries_to_scan:
+                    executor.submit(scan_library, library)
+                
+                try:
+                    remaining = len(libraries_to_scan)
+                    while remaining:
+                        library, item = scanned.get()
+                        
+                        if item is None:
+                            remaining -= 1
+                            if found_by_library[library.id]:
+                                logger.info(f"Found {found_by_library[library.id]} items with anime provider IDs in {library.name}")
+                            continue
+                        
+                        if item.id in seen:
+                            continue
+                        
+                        seen.add(item.id)
+                        found_by_library[library.id] += 1
+                        yield item
+                finally:
+                    stop.set()
+        finally:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
     
-    def remove_anime_provider_ids(self, item: MediaItem) -> Tuple[bool, int]:
+    def remove_anime_provider_ids(self, item: MediaItem,
+                                  anime_provider_keys: Optional[Set[str]] = None) -> Tuple[bool, int]:
         """
         Remove anime provider IDs from a media item.
         
         Args:
             item: MediaItem to clean
+            anime_provider_keys: Anime provider names already computed for the item
             
         Returns:
             Tuple of (success, number_of_ids_removed)
         """
-        anime_filter = AnimeProviderFilter()
-        anime_provider_ids = anime_filter.get_anime_provider_ids(item)
+        if anime_provider_keys is None:
+            anime_provider_keys = ANIME_FILTER.get_anime_provider_keys(item)
         
-        if not anime_provider_ids:
+        if not anime_provider_keys:
             return True, 0
         
         try:
             # Get current item details
-            user = self.media_library.primary_user
-            current_data = self.api.get_media_item_details(item.id, user.id)
+            current_data = self.api.get_media_item_details(item.id, self._user_id)
             
             if not current_data:
-                logger.error(f"Could not retrieve details for item: {item.name}")
+                logger.error("Could not retrieve details for item: %s", item.name)
                 return False, 0
             
             # Remove anime provider IDs
             current_provider_ids = current_data.get('ProviderIds', {})
             ids_removed = 0
             
-            for provider in anime_provider_ids:
+            for provider in anime_provider_keys:
                 if provider in current_provider_ids:
                     del current_provider_ids[provider]
                     ids_removed += 1
-                    logger.debug(f"Removed {provider} ID from {item.name}")
+                    logger.debug("Removed %s ID from %s", provider, item.name)
+            
+            # Nothing left to remove since the item was listed; skip the write
+            if ids_removed == 0:
+                return True, 0
             
-            # Update the item
+            # Update the item (Jellyfin replaces all editable fields from the
+            # posted body, so the full item from the GET above is sent back)
             current_data['ProviderIds'] = current_provider_ids
             
             self.api._make_request('POST', f'/Items/{item.id}', json_data=current_data)
             
-            logger.info(f"Cleaned {ids_removed} anime provider IDs from: {item.display_name}")
+            logger.info("Cleaned %d anime provider IDs from: %s", ids_removed, item.display_name)
             return True, ids_removed
             
         except JellyfinAPIError as e:
-            logger.error(f"Failed to clean provider IDs from {item.name}: {e}")
+            logger.error("Failed to clean provider IDs from %s: %s", item.name, e)
             return False, 0
     
-    def clean_episodes_for_series(self, series: MediaItem, dry_run: bool = False) -> Tuple[int, int, int]:
+    def remove_anime_provider_ids_bulk(self, items: Iterable[MediaItem],
+                                       anime_keys_by_item: Optional[Dict[str, Set[str]]] = None
+                                       ) -> Iterator[Tuple[MediaItem, bool, int]]:
+        """
+        Remove anime provider IDs from many media items concurrently.
+        
+        Items are submitted as they are drawn from ``items``, with a bounded
+        number of updates in flight, so a streaming source is consumed lazily.
+        
+        Args:
+            items: MediaItems to clean
+            anime_keys_by_item: Anime provider names already computed, keyed by item ID
+            
+        Yields:
+            Tuple of (item, success, number_of_ids_removed) as each update completes
+        """
+        anime_keys_by_item = anime_keys_by_item or {}
+        
+        # Updates go through the API's shared worker pool, so concurrent callers
+        # (such as the per-series episode passes) stay within one bounded pool
+        submit = self.api.submit
+        max_in_flight = self.api.max_workers * 2
+        futures = {}
+        
+        for item in items:
+            # Keep the pool busy without queueing the whole source up front
+            if len(futures) >= max_in_flight:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    success, ids_removed = future.result()
+                    yield futures.pop(future), success, ids_removed
+            
+            future = submit(self.remove_anime_provider_ids, item, anime_keys_by_item.get(item.id))
+            futures[future] = item
+        
+        for future in as_completed(futures):
+            success, ids_removed = future.result()
+            yield futures[future], success, ids_removed
+    
+    def clean_episodes_for_series(self, series: MediaItem, dry_run: bool = False,
+                                  episodes: Optional[List[EpisodeItem]] = None) -> Tuple[int, int, int]:
         """
         Clean anime provider IDs from all episodes of a series.
         
         Args:
             series: Series MediaItem
             dry_run: If True, only report what would be cleaned
+            episodes: Episodes already listed for the series; fetched from the server if omitted
             
         Returns:
             Tuple of (episodes_cleaned, episodes_skipped, episodes_failed)
         """
-        episodes = self.get_episodes_for_series(series.id)
-        anime_filter = AnimeProviderFilter()
+        if episodes is None:
+            episodes = self.get_episodes_for_series(series.id)
         
-        episodes_with_anime_ids = [
-            ep for ep in episodes 
-            if anime_filter.should_include(ep)
-        ]
+        # Filter and compute each episode's anime provider names in one pass
+        anime_keys_by_episode: Dict[str, Set[str]] = {}
+        episodes_with_anime_ids = []
+        for episode in episodes:
+            anime_provider_keys = ANIME_FILTER.get_anime_provider_keys(episode)
+            if anime_provider_keys:
+                anime_keys_by_episode[episode.id] = anime_provider_keys
+                episodes_with_anime_ids.append(episode)
         
         if not episodes_with_anime_ids:
-            logger.debug(f"No episodes with anime provider IDs found for series: {series.name}")
+            logger.debug("No episodes with anime provider IDs found for series: %s", series.name)
             return 0, 0, 0
         
-        logger.info(f"Found {len(episodes_with_anime_ids)} episodes with anime provider IDs in series: {series.name}")
+        logger.info("Found %d episodes with anime provider IDs in series: %s", len(episodes_with_anime_ids), series.name)
         
         cleaned = 0
         skipped = 0
         failed = 0
         
         for episode in episodes_with_anime_ids:
-            anime_provider_ids = anime_filter.get_anime_provider_ids(episode)
-            episode_identifier = f"S{episode.season_number or '?'}E{episode.episode_number or '?'} - {episode.name}"
+            anime_provider_keys = anime_keys_by_episode[episode.id]
             
-            logger.info(f"  Processing episode: {episode_identifier}")
-            logger.debug(f"    Anime provider IDs to remove: {list(anime_provider_ids.keys())}")
+            logger.info("  Processing episode: S%sE%s - %s",
+                        episode.season_number or '?', episode.episode_number or '?', episode.name)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Anime provider IDs to remove: %s", sorted(anime_provider_keys))
             
             if dry_run:
                 cleaned += 1
-                logger.info(f"    [DRY RUN] Would remove {len(anime_provider_ids)} provider IDs")
-            else:
-                success, ids_removed = self.remove_anime_provider_ids(episode)
-                
-                if success:
-                    if ids_removed > 0:
-                        cleaned += 1
-                        logger.info(f"    Cleaned {ids_removed} anime provider IDs")
-                    else:
-                        skipped += 1
-                        logger.debug(f"    No changes needed")
+                logger.info("    [DRY RUN] Would remove %d provider IDs", len(anime_provider_keys))
+        
+        if dry_run:
+            return cleaned, skipped, failed
+        
+        # Send the series' episode updates through the worker pool together
+        for episode, success, ids_removed in self.remove_anime_provider_ids_bulk(
+            episodes_with_anime_ids, anime_keys_by_episode
+        ):
+            if success:
+                if ids_removed > 0:
+                    cleaned += 1
                 else:
-                    failed += 1
-                    logger.error(f"    Failed to clean episode")
+                    skipped += 1
+                    logger.debug("    No changes needed for episode: %s", episode.name)
+            else:
+                failed += 1
+                logger.error("    Failed to clean episode: %s", episode.name)
         
         return cleaned, skipped, failed
     
     def run_cleanup(self, dry_run: bool = False, include_episodes: bool = True, 
-                   clean_series_episodes: bool = True) -> CleanupResult:
+                   clean_series_episodes: bool = True, incremental: bool = False,
+                   force: bool = False) -> CleanupResult:
         """
         Run the cleanup process to remove anime provider IDs from non-anime items.
         
@@ -425,6 +799,8 @@ class AnimeProviderCleaner:
             dry_run: If True, only report what would be cleaned without making changes
             include_episodes: Whether to include individual episodes in cleanup
             clean_series_episodes: Whether to clean episodes for series that have anime provider IDs
+            incremental: Only scan items saved since the last complete run (needs a library cache)
+            force: Clean every library even when no anime library was identified
             
         Returns:
             CleanupResult with operation statistics
@@ -434,55 +810,126 @@ class AnimeProviderCleaner:
         if dry_run:
             logger.info("DRY RUN MODE - No changes will be made")
         
-        # Get items that need cleaning
-        items_to_clean = self.get_non_anime_items_with_anime_providers()
+        # Load libraries first: a changed classification resets the incremental checkpoint
+        libraries = self.get_libraries()
+        anime_library_ids = self.get_anime_library_ids()
         
-        if not items_to_clean:
-            logger.info("No items found that need cleaning")
+        # Skip the item scan when the classification leaves nothing to do
+        if libraries and len(anime_library_ids) == len(libraries):
+            logger.info("All libraries are anime libraries; nothing to clean")
+            return CleanupResult(0, 0, 0, 0, 0)
+        if libraries and not anime_library_ids and not force:
+            logger.warning("No anime libraries identified; every library would be cleaned. "
+                           "Use --force to do so anyway")
             return CleanupResult(0, 0, 0, 0, 0)
         
-        logger.info(f"Found {len(items_to_clean)} items that need cleaning")
+        # Items saved before the last complete scan were already confirmed clean
+        self._scan_failed = False
+        scan_started = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        last_scan = None
+        if incremental and self.library_cache is not None:
+            last_scan = self.library_cache.get_last_scan()
+            if last_scan:
+                logger.info(f"Incremental scan: only checking items saved since {last_scan}")
         
-        # Initialize result
-        result = CleanupResult(
-            total_items_processed=len(items_to_clean),
-            items_cleaned=0,
-            items_skipped=0,
-            items_failed=0,
-            provider_ids_removed=0
-        )
+        # Anime provider names are computed once per item; series are kept
+        # for the episode pass once the item updates are done
+        anime_keys_by_item: Dict[str, Set[str]] = {}
+        series_to_clean: List[MediaItem] = []
         
-        # Process each item
-        for item in items_to_clean:
-            anime_filter = AnimeProviderFilter()
-            anime_provider_ids = anime_filter.get_anime_provider_ids(item)
-            
-            logger.info(f"Processing: {item.display_name}")
-            logger.info(f"  Anime provider IDs to remove: {list(anime_provider_ids.keys())}")
-            
-            if dry_run:
-                result.items_cleaned += 1
-                result.provider_ids_removed += len(anime_provider_ids)
-                logger.info(f"  [DRY RUN] Would remove {len(anime_provider_ids)} provider IDs")
-            else:
-                success, ids_removed = self.remove_anime_provider_ids(item)
+        # Scanned episodes grouped by series, with their (success, ids_removed)
+        # outcome, so the episode pass does not have to list each series again
+        episodes_by_series: Dict[str, List[MediaItem]] = defaultdict(list)
+        episode_outcomes: Dict[str, Tuple[bool, int]] = {}
+        
+        def items_to_clean() -> Iterator[MediaItem]:
+            for item in self.iter_non_anime_items_with_anime_providers(include_episodes, last_scan):
+                anime_provider_keys = ANIME_FILTER.get_anime_provider_keys(item)
+                anime_keys_by_item[item.id] = anime_provider_keys
+                if item.media_type == MediaType.SERIES:
+                    series_to_clean.append(item)
+                elif item.media_type == MediaType.EPISODE and item.series_id:
+                    episodes_by_series[item.series_id].append(item)
+                
+                logger.info("Processing: %s", item.display_name)
+                logger.info("  Anime provider IDs to remove: %s", sorted(anime_provider_keys))
+                
+                yield item
+        
+        # Counters stay in locals while items stream through and are stored
+        # on the result once the phase is done
+        items_cleaned = items_skipped = items_failed = provider_ids_removed = 0
+        
+        # Updates start as soon as the first items are scanned
+        if dry_run:
+            for item in items_to_clean():
+                ids_to_remove = len(anime_keys_by_item[item.id])
+                items_cleaned += 1
+                provider_ids_removed += ids_to_remove
+                if item.media_type == MediaType.EPISODE:
+                    episode_outcomes[item.id] = (True, ids_to_remove)
+                logger.info("  [DRY RUN] Would remove %d provider IDs", ids_to_remove)
+        else:
+            for item, success, ids_removed in self.remove_anime_provider_ids_bulk(items_to_clean(), anime_keys_by_item):
+                if item.media_type == MediaType.EPISODE:
+                    episode_outcomes[item.id] = (success, ids_removed)
                 
                 if success:
                     if ids_removed > 0:
-                        result.items_cleaned += 1
-                        result.provider_ids_removed += ids_removed
+                        items_cleaned += 1
+                        provider_ids_removed += ids_removed
                     else:
-                        result.items_skipped += 1
+                        items_skipped += 1
                 else:
-                    result.items_failed += 1
+                    items_failed += 1
+        
+        # Every item that reached the updaters was given its key set
+        result = CleanupResult(
+            total_items_processed=len(anime_keys_by_item),
+            items_cleaned=items_cleaned,
+            items_skipped=items_skipped,
+            items_failed=items_failed,
+            provider_ids_removed=provider_ids_removed
+        )
+        
+        if not result.total_items_processed:
+            logger.info("No items found that need cleaning")
+            self._record_scan(scan_started, result, dry_run, include_episodes)
+            return result
+        
+        logger.info(f"Found {result.total_items_processed} items that need cleaning")
+        
+        # Clean episodes for series if requested
+        episodes_processed = episodes_cleaned = episodes_failed = 0
+        if clean_series_episodes and series_to_clean and include_episodes:
+            # The library scan already returned every episode with anime provider
+            # IDs and cleaned it above; report those without re-listing each series
+            for series in series_to_clean:
+                for episode in episodes_by_series.get(series.id, ()):
+                    success, ids_removed = episode_outcomes[episode.id]
+                    episodes_processed += 1
+                    if not success:
+                        episodes_failed += 1
+                    elif ids_removed > 0:
+                        episodes_cleaned += 1
+        elif clean_series_episodes and series_to_clean:
+            def clean_series(series: MediaItem) -> Tuple[int, int, int]:
+                logger.info("Cleaning episodes for series: %s", series.name)
+                return self.clean_episodes_for_series(series, dry_run)
             
-            # Clean episodes for series if requested
-            if clean_series_episodes and item.media_type == MediaType.SERIES:
-                logger.info(f"Cleaning episodes for series: {item.name}")
-                ep_cleaned, ep_skipped, ep_failed = self.clean_episodes_for_series(item, dry_run)
-                result.episodes_processed += ep_cleaned + ep_skipped + ep_failed
-                result.episodes_cleaned += ep_cleaned
-                result.episodes_failed += ep_failed
+            # Each series needs its own episode listing; fetch them concurrently
+            # and merge the counts here rather than sharing the result across threads.
+            # The episode updates all run on the API's shared pool, so the number
+            # of update requests in flight does not grow with SCAN_WORKERS
+            with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+                for ep_cleaned, ep_skipped, ep_failed in executor.map(clean_series, series_to_clean):
+                    episodes_processed += ep_cleaned + ep_skipped + ep_failed
+                    episodes_cleaned += ep_cleaned
+                    episodes_failed += ep_failed
+        
+        result.episodes_processed = episodes_processed
+        result.episodes_cleaned = episodes_cleaned
+        result.episodes_failed = episodes_failed
         
         # Log results
         logger.info("Cleanup completed!")
@@ -497,7 +944,37 @@ class AnimeProviderCleaner:
             logger.info(f"Episodes cleaned: {result.episodes_cleaned}")
             logger.info(f"Episodes failed: {result.episodes_failed}")
         
+        self._record_scan(scan_started, result, dry_run, include_episodes)
         return result
+    
+    def _record_scan(self, scan_started: str, result: CleanupResult, dry_run: bool,
+                     include_episodes: bool) -> None:
+        """
+        Save the scan checkpoint used by incremental runs.
+        
+        The checkpoint only advances after a real run with no failures, so items
+        that could not be cleaned or libraries that could not be fully listed
+        are picked up again next time. Runs that skip episodes do not advance
+        it either, as a later full run would otherwise never check the
+        episodes saved before them.
+        
+        Args:
+            scan_started: Time the scan started (ISO 8601, UTC)
+            result: Result of the cleanup run
+            dry_run: Whether the run was a dry run
+            include_episodes: Whether the scan covered individual episodes
+        """
+        if self.library_cache is None or dry_run:
+            return
+        if not include_episodes:
+            logger.info("Episodes were skipped; keeping the previous incremental checkpoint")
+            return
+        if result.items_failed or result.episodes_failed:
+            return
+        if self._scan_failed:
+            logger.warning("Scan was incomplete; keeping the previous incremental checkpoint")
+            return
+        self.library_cache.set_last_scan(scan_started)
 
 
 def main():
@@ -531,6 +1008,33 @@ def main():
         action='store_true',
         help='Skip cleaning episodes for series that have anime provider IDs'
     )
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=LIBRARY_CACHE_TTL / 3600,
+        help='Hours to reuse the cached library list before re-fetching it (default: 24)'
+    )
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Ignore the cached library list and fetch it from the server'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only check items saved since the last complete run (use --refresh-cache to force a full scan)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Clean every library even if no anime library is identified'
+    )
+    parser.add_argument(
+        '--parse-processes',
+        type=int,
+        default=0,
+        help='Decode library pages in this many worker processes (default: 0, decode in the scanning threads)'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -558,12 +1062,19 @@ def main():
         # Create media library instance
         media_library = create_media_library(base_url, api_key)
         
+        # Set up the library cache
+        library_cache = LibraryCache(base_url, ttl=args.cache_ttl * 3600)
+        if args.refresh_cache:
+            library_cache.invalidate()
+        
         # Create cleaner and run
-        cleaner = AnimeProviderCleaner(media_library.api)
+        cleaner = AnimeProviderCleaner(media_library.api, library_cache, args.parse_processes)
         result = cleaner.run_cleanup(
             dry_run=args.dry_run,
             include_episodes=not args.skip_episodes,
-            clean_series_episodes=not args.skip_series_episodes
+            clean_series_episodes=not args.skip_series_episodes,
+            incremental=args.incremental,
+            force=args.force
         )
         
         # Return appropriate exit code
@@ -578,4 +1089,4 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -7,26 +7,51 @@ It provides comprehensive mapping capabilities with custom mappings support and
 
 import time
 import logging
-import json
 import os
-from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
-from dataclasses import dataclass
+import threading
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum
+from types import MappingProxyType
 
 # Import the core Jellyfin API components
 from jellyfin_core import (
-    JellyfinAPI, MediaLibrary, MediaItem, MediaType, MediaFilter,
-    create_media_library, JellyfinAPIError
+    JellyfinAPI, MediaLibrary, MediaItem, MediaType, MediaFilter, ParentalRating,
+    create_media_library, JellyfinAPIError, loads_json, dumps_json
 )
 from vars import JELLYFIN_URL, JELLYFIN_API_KEY
 
 # Configuration
 LOG_FILE = "rating_remapping_log.txt"
+LOG_FILE_BUFFER_SIZE = 1 << 20  # bytes buffered before each log file write
 CUSTOM_MAPPINGS_FILE = "custom_rating_mappings.json"
+RATING_MAPPINGS_CACHE_FILE = os.path.expanduser("~/.cache/aus_rating/rating_mappings.json")
+RATING_MAPPINGS_CACHE_TTL = 24 * 60 * 60  # seconds before the server's ratings are fetched again
 REQUEST_DELAY = 0.1  # seconds between API requests
+MAX_WORKERS = 16  # concurrent rating updates in flight
+MAX_PENDING_UPDATES = 50  # rating updates queued ahead of the workers
+PROGRESS_LOG_INTERVAL = 50  # rating updates between progress log lines
+MAX_UNMAPPABLE_EXAMPLES = 5  # example titles kept per unmappable rating
 
 # Australian official rating system
-AUSTRALIAN_RATINGS = {'E', 'G', 'PG', 'M', 'MA 15+', 'R 18+', 'X 18+', 'RC'}
+AUSTRALIAN_RATINGS: FrozenSet[str] = frozenset({'E', 'G', 'PG', 'M', 'MA 15+', 'R 18+', 'X 18+', 'RC'})
+
+# Direct mappings for common non-Australian ratings (read-only)
+DIRECT_RATING_MAPPINGS: Mapping[str, str] = MappingProxyType({
+    "PG-13": "PG",
+    "R": "R 18+",
+    "R18+": "R 18+",
+    "MA15+": "MA 15+",
+    "TV-G": "G",
+    "TV-PG": "PG",
+    "TV-14": "M",
+    "TV-MA": "MA 15+",
+    "Unrated": "M",
+    "Not Rated": "M",
+})
 
 # Setup logging
 logging.basicConfig(
@@ -40,7 +65,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+class UpdateStatus(Enum):
+    """Outcome of a rating update, valued by its log label"""
+    UPDATED = "[UPDATED]"
+    SKIPPED = "[SKIPPED]"
+    FAILED = "[FAILED]"
+
+
+@dataclass(slots=True)
 class RatingUpdate:
     """Container for rating update information"""
     item_id: str
@@ -48,14 +80,59 @@ class RatingUpdate:
     media_type: str
     old_rating: str
     new_rating: str
-    success: bool = False
-    was_updated: bool = False
+    # Counts as failed until an outcome is recorded
+    status: UpdateStatus = UpdateStatus.FAILED
+    _log_entry: Optional[str] = field(default=None, init=False, repr=False)
+    
+    @property
+    def success(self) -> bool:
+        """Whether the update succeeded, with or without a change"""
+        return self.status is not UpdateStatus.FAILED
+    
+    @property
+    def was_updated(self) -> bool:
+        """Whether the rating was changed on the server"""
+        return self.status is UpdateStatus.UPDATED
     
     @property
     def log_entry(self) -> str:
-        """Generate formatted log entry"""
-        status = "[UPDATED]" if self.was_updated else "[SKIPPED]" if self.success else "[FAILED]"
-        return f"{self.name} ({self.media_type}) -> {self.old_rating} -> {self.new_rating} {status}"
+        """Formatted log entry, built once the update outcome is known"""
+        if self._log_entry is None:
+            self._log_entry = format_log_entry(
+                self.name, self.media_type, self.old_rating, self.new_rating, self.status.value
+            )
+        return self._log_entry
+
+
+def format_log_entry(name: str, media_type: str, old_rating: str, new_rating: str, status: str) -> str:
+    """Format a single rating log line"""
+    return f"{name} ({media_type}) -> {old_rating} -> {new_rating} {status}"
+
+
+class TokenBucket:
+    """Token bucket rate limiter that allows short bursts"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            
+            time.sleep(delay)
 
 
 class RatedMediaFilter(MediaFilter):
@@ -64,6 +141,10 @@ class RatedMediaFilter(MediaFilter):
     def should_include(self, media_item: MediaItem) -> bool:
         """Only include items with official ratings"""
         return media_item.official_rating is not None and media_item.official_rating.strip() != ""
+    
+    def to_query_params(self) -> Dict[str, str]:
+        """Let Jellyfin drop unrated items before they are sent"""
+        return {"HasOfficialRating": "true"}
 
 
 class CustomMappingsManager:
@@ -72,6 +153,7 @@ class CustomMappingsManager:
     def __init__(self, mappings_file: str = CUSTOM_MAPPINGS_FILE):
         self.mappings_file = mappings_file
         self.mappings_data = self._load_mappings()
+        self._unmappable_index = self._build_unmappable_index()
     
     def _load_mappings(self) -> Dict:
         """Load custom mappings from JSON file"""
@@ -93,55 +175,58 @@ class CustomMappingsManager:
             return initial_data
         
         try:
-            with open(self.mappings_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            with open(self.mappings_file, 'rb') as f:
+                return loads_json(f.read())
+        except (ValueError, IOError) as e:
             logger.error(f"Failed to load custom mappings file: {e}")
             return {"mappings": {}, "unmappable_ratings": [], "metadata": {}}
     
     def _save_mappings(self, data: Dict):
         """Save mappings data to JSON file"""
         try:
-            with open(self.mappings_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(self.mappings_file, 'wb') as f:
+                f.write(dumps_json(data))
         except IOError as e:
             logger.error(f"Failed to save custom mappings file: {e}")
     
+    def _build_unmappable_index(self) -> Dict[str, Dict]:
+        """Index unmappable entries by rating, converting old string entries in place"""
+        unmappable = self.mappings_data.setdefault("unmappable_ratings", [])
+        index = {}
+        
+        for position, entry in enumerate(unmappable):
+            if isinstance(entry, str):
+                # Convert old format to new format
+                entry = unmappable[position] = {"rating": entry, "examples": [], "count": 1}
+            if isinstance(entry, dict) and entry.get("rating") is not None:
+                index.setdefault(entry["rating"], entry)
+        
+        return index
+    
     def get_custom_mapping(self, rating: str) -> Optional[str]:
         """Get custom mapping for a rating"""
         return self.mappings_data.get("mappings", {}).get(rating)
     
     def add_unmappable_rating(self, rating: str, media_examples: List[str] = None):
         """Add a rating to the unmappable list with examples"""
-        unmappable = self.mappings_data.setdefault("unmappable_ratings", [])
-        
         # Check if rating already exists
-        existing_entry = None
-        for entry in unmappable:
-            if isinstance(entry, dict) and entry.get("rating") == rating:
-                existing_entry = entry
-                break
-            elif isinstance(entry, str) and entry == rating:
-                # Convert old format to new format
-                unmappable.remove(entry)
-                existing_entry = {"rating": rating, "examples": [], "count": 1}
-                unmappable.append(existing_entry)
-                break
+        existing_entry = self._unmappable_index.get(rating)
         
         if existing_entry:
             existing_entry["count"] = existing_entry.get("count", 1) + 1
             if media_examples:
                 existing_examples = existing_entry.setdefault("examples", [])
                 for example in media_examples:
-                    if example not in existing_examples and len(existing_examples) < 5:
+                    if example not in existing_examples and len(existing_examples) < MAX_UNMAPPABLE_EXAMPLES:
                         existing_examples.append(example)
         else:
             new_entry = {
                 "rating": rating,
                 "count": 1,
-                "examples": media_examples[:5] if media_examples else []
+                "examples": media_examples[:MAX_UNMAPPABLE_EXAMPLES] if media_examples else []
             }
-            unmappable.append(new_entry)
+            self.mappings_data["unmappable_ratings"].append(new_entry)
+            self._unmappable_index[rating] = new_entry
     
     def update_mappings_stats(self, total_mappable: int, total_unmappable: int):
         """Update statistics in the mappings file"""
@@ -166,15 +251,77 @@ class AustralianRatingProcessor:
         self.media_library = media_library
         self.custom_mappings = custom_mappings
         self._rating_mappings: Optional[Dict[str, str]] = None
-        self._unmappable_ratings: Dict[str, List[str]] = defaultdict(list)
+        self._final_rating_map: Optional[Dict[str, str]] = None
+        # (name, media_type, rating) for items whose rating is already correct
+        self.unchanged_ratings: List[Tuple[str, str, str]] = []
+        # Example titles per unmappable rating, capped, with the full count kept separately
+        self._unmappable_ratings: Dict[str, List[str]] = {}
+        self._unmappable_counts: Counter = Counter()
     
     def get_rating_mappings(self) -> Dict[str, str]:
         """Build mapping from non-Australian ratings to Australian equivalents"""
         if self._rating_mappings is not None:
             return self._rating_mappings
         
-        parental_ratings = self.media_library.api.get_parental_ratings()
+        # The value-based mappings only change with the server's rating list,
+        # so a fresh cached copy saves fetching the parental ratings at all
+        mappings = self._load_cached_value_mappings()
+        if mappings is None:
+            parental_ratings = self.media_library.api.get_parental_ratings()
+            mappings = self._get_value_mappings(parental_ratings)
+            if parental_ratings:
+                self._save_cached_value_mappings(mappings)
+        
+        # Add direct mappings for common cases
+        mappings.update(DIRECT_RATING_MAPPINGS)
+        
+        # Add custom mappings from JSON file
+        custom_mappings = self.custom_mappings.mappings_data.get("mappings", {})
+        mappings.update(custom_mappings)
+        
+        self._rating_mappings = mappings
+        logger.info(f"Created {len(mappings)} rating mappings ({len(custom_mappings)} custom)")
+        return mappings
+    
+    def _load_cached_value_mappings(self) -> Optional[Dict[str, str]]:
+        """Load the value-based mappings saved for this server, unless they have expired"""
+        try:
+            with open(RATING_MAPPINGS_CACHE_FILE, 'rb') as f:
+                cached = loads_json(f.read())
+        except FileNotFoundError:
+            return None
+        except (ValueError, IOError) as e:
+            logger.warning(f"Ignoring unreadable rating mappings cache: {e}")
+            return None
+        
+        entry = cached.get(self.media_library.api.base_url) if isinstance(cached, dict) else None
+        if not entry or entry.get("fetched_at", 0) < time.time() - RATING_MAPPINGS_CACHE_TTL:
+            return None
         
+        logger.debug(f"Loaded value-based rating mappings from {RATING_MAPPINGS_CACHE_FILE}")
+        return dict(entry.get("mappings", {}))
+    
+    def _save_cached_value_mappings(self, mappings: Dict[str, str]) -> None:
+        """Save the value-based mappings for this server, keeping other servers' entries"""
+        try:
+            with open(RATING_MAPPINGS_CACHE_FILE, 'rb') as f:
+                cached = loads_json(f.read())
+            if not isinstance(cached, dict):
+                cached = {}
+        except (ValueError, IOError):
+            cached = {}
+        
+        cached[self.media_library.api.base_url] = {"fetched_at": time.time(), "mappings": mappings}
+        
+        try:
+            os.makedirs(os.path.dirname(RATING_MAPPINGS_CACHE_FILE), exist_ok=True)
+            with open(RATING_MAPPINGS_CACHE_FILE, 'wb') as f:
+                f.write(dumps_json(cached))
+        except IOError as e:
+            logger.warning(f"Failed to write rating mappings cache: {e}")
+    
+    def _get_value_mappings(self, parental_ratings: Dict[str, ParentalRating]) -> Dict[str, str]:
+        """Map non-Australian ratings to Australian ones with the same value"""
         # Create mapping based on rating values
         australian_by_value = {}
         non_australian_by_value = {}
@@ -190,129 +337,155 @@ class AustralianRatingProcessor:
         for value, non_aus_name in non_australian_by_value.items():
             if value in australian_by_value:
                 mappings[non_aus_name] = australian_by_value[value]
-                logger.debug(f"Mapped {non_aus_name} -> {australian_by_value[value]} (value: {value})")
-        
-        # Add direct mappings for common cases
-        direct_mappings = {
-            "PG-13": "PG",
-            "R": "R 18+",
-            "R18+": "R 18+",
-            "MA15+": "MA 15+",
-            "TV-G": "G",
-            "TV-PG": "PG",
-            "TV-14": "M",
-            "TV-MA": "MA 15+",
-            "Unrated": "M",
-            "Not Rated": "M",
-        }
-        mappings.update(direct_mappings)
-        
-        # Add custom mappings from JSON file
-        custom_mappings = self.custom_mappings.mappings_data.get("mappings", {})
-        mappings.update(custom_mappings)
+                logger.debug("Mapped %s -> %s (value: %s)", non_aus_name, australian_by_value[value], value)
         
-        self._rating_mappings = mappings
-        logger.info(f"Created {len(mappings)} rating mappings ({len(custom_mappings)} custom)")
         return mappings
     
-    def map_to_australian_rating(self, rating: Optional[str], media_name: str = "") -> Optional[str]:
-        """Convert rating to Australian format"""
+    def get_final_rating_map(self) -> Dict[str, str]:
+        """Map every known rating, Australian ones included, to its final Australian value"""
+        if self._final_rating_map is None:
+            final_map = {name: value for name, value in self.get_rating_mappings().items() if value}
+            # Australian ratings always map to themselves, whatever the mappings say
+            final_map.update((rating, rating) for rating in AUSTRALIAN_RATINGS)
+            self._final_rating_map = final_map
+        return self._final_rating_map
+    
+    def map_to_australian_rating(self, rating: Optional[str], media_name: str = "",
+                                 final_map: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Convert rating to Australian format, using a pre-fetched final rating map when given"""
         if not rating:
             return None
         
         rating_stripped = rating.strip()
         
-        # If already Australian, return as-is
-        if rating_stripped in AUSTRALIAN_RATINGS:
-            return rating_stripped
-        
-        # Try to map using all available mappings
-        mappings = self.get_rating_mappings()
-        mapped_rating = mappings.get(rating_stripped)
+        # One lookup covers both already-Australian and mapped ratings
+        if final_map is None:
+            final_map = self.get_final_rating_map()
+        mapped_rating = final_map.get(rating_stripped)
         
-        if mapped_rating:
-            logger.debug(f"Mapped rating {rating_stripped} -> {mapped_rating}")
+        if mapped_rating is not None:
             return mapped_rating
         
         # If no mapping found, add to unmappable list
-        logger.warning(f"No Australian mapping found for rating: {rating_stripped}")
-        self._unmappable_ratings[rating_stripped].append(media_name)
+        examples = self._unmappable_ratings.get(rating_stripped)
+        if examples is None:
+            logger.warning("No Australian mapping found for rating: %s", rating_stripped)
+            examples = self._unmappable_ratings[rating_stripped] = []
+        if len(examples) < MAX_UNMAPPABLE_EXAMPLES:
+            examples.append(media_name)
+        self._unmappable_counts[rating_stripped] += 1
         return rating_stripped  # Return original if no mapping found
     
     def process_media_ratings(self, media_items: List[MediaItem]) -> List[RatingUpdate]:
-        """Process all media items and create rating updates"""
+        """Process all media items and create updates for ratings that will change"""
         rating_updates = []
+        unchanged_ratings = self.unchanged_ratings = []
+        add_update = rating_updates.append
+        add_unchanged = unchanged_ratings.append
+        # Fetch the mappings once rather than per item
+        final_map = self.get_final_rating_map()
+        map_rating = self.map_to_australian_rating
+        # Libraries hold only a handful of distinct ratings, so resolve each one once
+        resolved_ratings: Dict[str, str] = {}
         
         for media_item in media_items:
-            # Convert to Australian rating
-            australian_rating = self.map_to_australian_rating(
-                media_item.official_rating,
-                media_item.name
-            )
+            old_rating = media_item.official_rating or ""
+            new_rating = resolved_ratings.get(old_rating)
+            
+            if new_rating is None:
+                # Convert to Australian rating
+                australian_rating = map_rating(
+                    media_item.official_rating,
+                    media_item.name,
+                    final_map
+                )
+                new_rating = australian_rating or ""
+                
+                # Unmappable ratings stay uncached so every affected item is recorded
+                if not old_rating or old_rating.strip() in final_map:
+                    resolved_ratings[old_rating] = new_rating
+            
+            # Rating is already Australian, so only note it for the log
+            if new_rating == old_rating:
+                add_unchanged((media_item.name, media_item.media_type.value, old_rating))
+                continue
             
             # Create rating update record
             update = RatingUpdate(
                 item_id=media_item.id,
                 name=media_item.name,
                 media_type=media_item.media_type.value,
-                old_rating=media_item.official_rating or "",
-                new_rating=australian_rating or ""
+                old_rating=old_rating,
+                new_rating=new_rating
             )
             
-            rating_updates.append(update)
+            add_update(update)
         
         return rating_updates
     
     def apply_rating_updates(self, rating_updates: List[RatingUpdate]) -> Tuple[int, int, int]:
         """Apply rating updates to Jellyfin and return success statistics"""
-        successful_updates = 0
-        skipped_updates = 0
-        failed_updates = 0
+        if not rating_updates:
+            return 0, 0, 0
         
-        for update in rating_updates:
-            # Only update if the rating actually changed
-            if update.new_rating != update.old_rating:
-                try:
-                    success, was_updated = self.media_library.api.update_official_rating(
-                        update.item_id,
-                        self.media_library.primary_user.id,
-                        update.new_rating
-                    )
-                    
-                    update.success = success
-                    update.was_updated = was_updated
+        # Resolve the user and bound methods once rather than per item
+        user_id = self.media_library.primary_user.id
+        update_official_rating = self.media_library.api.update_official_rating
+        # Up to one burst of requests starts at once, then they are paced at one per delay
+        rate_limiter = TokenBucket(1 / REQUEST_DELAY, burst=MAX_WORKERS)
+        wait_for_slot = rate_limiter.acquire
+        outcomes: Counter = Counter()
+        futures = {}
+        
+        def collect(future) -> None:
+            update = futures.pop(future)
+            try:
+                success, was_updated = future.result()
+                
+                if success and was_updated:
+                    update.status = UpdateStatus.UPDATED
+                    logger.info("Updated: %s", update.log_entry)
+                elif success and not was_updated:
+                    update.status = UpdateStatus.SKIPPED
+                    logger.debug("Skipped: %s", update.log_entry)
+                else:
+                    update.status = UpdateStatus.FAILED
+                    logger.error("Failed: %s", update.log_entry)
                     
-                    if success and was_updated:
-                        successful_updates += 1
-                        logger.info(f"Updated: {update.log_entry}")
-                    elif success and not was_updated:
-                        skipped_updates += 1
-                        logger.debug(f"Skipped: {update.log_entry}")
-                    else:
-                        failed_updates += 1
-                        logger.error(f"Failed: {update.log_entry}")
-                        
-                except Exception as e:
-                    logger.error(f"Exception updating {update.name}: {e}")
-                    update.success = False
-                    failed_updates += 1
-            else:
-                # Rating was already Australian
-                update.success = True
-                update.was_updated = False
-                skipped_updates += 1
-                logger.debug(f"Already Australian: {update.log_entry}")
+            except Exception as e:
+                logger.error("Exception updating %s: %s", update.name, e)
+                update.status = UpdateStatus.FAILED
             
-            # Small delay to be nice to the API
-            time.sleep(REQUEST_DELAY)
+            outcomes[update.status] += 1
+            processed = sum(outcomes.values())
+            if processed % PROGRESS_LOG_INTERVAL == 0 or processed == len(rating_updates):
+                logger.info(f"Applied {processed}/{len(rating_updates)} rating changes")
+        
+        # Updates run on the client's shared worker pool, sized by MAX_WORKERS
+        submit = self.media_library.api.submit
+        for update in rating_updates:
+            # A finished update frees its slot straight away, so the workers never
+            # wait for the slowest request of a batch before more work arrives
+            if len(futures) >= MAX_PENDING_UPDATES:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+            
+            wait_for_slot()
+            future = submit(update_official_rating, update.item_id, user_id, update.new_rating)
+            futures[future] = update
+        
+        for future in as_completed(list(futures)):
+            collect(future)
         
-        return successful_updates, skipped_updates, failed_updates
+        return outcomes[UpdateStatus.UPDATED], outcomes[UpdateStatus.SKIPPED], outcomes[UpdateStatus.FAILED]
     
     def finalize_unmappable_ratings(self):
         """Save unmappable ratings to the custom mappings file"""
         if self._unmappable_ratings:
             logger.info(f"Found {len(self._unmappable_ratings)} unmappable rating types")
             for rating, media_examples in self._unmappable_ratings.items():
+                logger.info("Unmappable rating %s: %d items", rating, self._unmappable_counts[rating])
                 self.custom_mappings.add_unmappable_rating(rating, media_examples)
             
             # Update statistics
@@ -331,7 +504,10 @@ class AustralianRatingMapper:
     def __init__(self, jellyfin_url: str, jellyfin_api_key: str):
         """Initialize the rating mapper with Jellyfin connection"""
         try:
-            self.media_library = create_media_library(jellyfin_url, jellyfin_api_key)
+            # One keep-alive connection per update worker so none are discarded
+            self.media_library = create_media_library(
+                jellyfin_url, jellyfin_api_key, pool_size=MAX_WORKERS, max_workers=MAX_WORKERS
+            )
             self.custom_mappings = CustomMappingsManager()
             self.rating_processor = AustralianRatingProcessor(
                 self.media_library, 
@@ -346,43 +522,58 @@ class AustralianRatingMapper:
         """Get all movies and series that have official ratings"""
         logger.info("Fetching media with ratings from Jellyfin...")
         
+        media_filter = RatedMediaFilter()
         media_items = self.media_library.api.get_media_items(
             user_id=self.media_library.primary_user.id,
             media_types=[MediaType.MOVIE, MediaType.SERIES],
-            media_filter=RatedMediaFilter()
+            media_filter=media_filter,
+            extra_params=media_filter.to_query_params()
         )
         
         # Count by type for reporting
-        movies = sum(1 for m in media_items if m.media_type == MediaType.MOVIE)
-        series = sum(1 for m in media_items if m.media_type == MediaType.SERIES)
+        counts = Counter(m.media_type for m in media_items)
         
-        logger.info(f"Found {movies} movies and {series} TV series with ratings to process")
+        logger.info(f"Found {counts[MediaType.MOVIE]} movies and {counts[MediaType.SERIES]} TV series with ratings to process")
         return media_items
     
-    def write_log_file(self, rating_updates: List[RatingUpdate]):
+    def write_log_file(self, rating_updates: List[RatingUpdate],
+                       unchanged_ratings: List[Tuple[str, str, str]] = ()):
         """Write comprehensive log file with all update results"""
         try:
-            updated_media = [u.log_entry for u in rating_updates if u.was_updated]
-            unchanged_media = [u.log_entry for u in rating_updates if u.success and not u.was_updated]
-            failed_media = [u.log_entry for u in rating_updates if not u.success]
+            by_status = {status: [] for status in UpdateStatus}
+            for update in rating_updates:
+                by_status[update.status].append(update)
+            updated_media = by_status[UpdateStatus.UPDATED]
+            unchanged_media = by_status[UpdateStatus.SKIPPED]
+            failed_media = by_status[UpdateStatus.FAILED]
+            
+            sections = (
+                ("=== Successfully Updated to Australian Ratings ===",
+                 (u.log_entry for u in updated_media)),
+                ("=== Already Had Australian Ratings (Unchanged) ===",
+                 chain((u.log_entry for u in unchanged_media),
+                       (format_log_entry(name, media_type, rating, rating, UpdateStatus.SKIPPED.value)
+                        for name, media_type, rating in unchanged_ratings))),
+                ("=== Failed to Update ===",
+                 (u.log_entry for u in failed_media)),
+            )
             
-            with open(LOG_FILE, "w", encoding="utf-8") as f:
+            with open(LOG_FILE, "w", encoding="utf-8", buffering=LOG_FILE_BUFFER_SIZE) as f:
                 f.write("=== Australian Rating Remapping Results ===\n\n")
                 
-                f.write("=== Successfully Updated to Australian Ratings ===\n")
-                f.write("\n".join(updated_media) + "\n\n")
-                
-                f.write("=== Already Had Australian Ratings (Unchanged) ===\n")
-                f.write("\n".join(unchanged_media) + "\n\n")
-                
-                f.write("=== Failed to Update ===\n")
-                f.write("\n".join(failed_media) + "\n\n")
+                # Write entries one at a time rather than joining each section into one string
+                for heading, entries in sections:
+                    f.write(heading + "\n")
+                    for entry in entries:
+                        f.write(entry)
+                        f.write("\n")
+                    f.write("\n")
                 
                 # Add statistics
                 f.write("=== Summary Statistics ===\n")
-                f.write(f"Total media processed: {len(rating_updates)}\n")
+                f.write(f"Total media processed: {len(rating_updates) + len(unchanged_ratings)}\n")
                 f.write(f"Successfully updated: {len(updated_media)}\n")
-                f.write(f"Already Australian: {len(unchanged_media)}\n")
+                f.write(f"Already Australian: {len(unchanged_media) + len(unchanged_ratings)}\n")
                 f.write(f"Failed updates: {len(failed_media)}\n")
             
             logger.info(f"Log file written to: {LOG_FILE}")
@@ -403,17 +594,21 @@ class AustralianRatingMapper:
             logger.info("Processing rating mappings...")
             rating_updates = self.rating_processor.process_media_ratings(media_items)
             
-            # Apply updates to Jellyfin
-            logger.info("Applying rating updates to Jellyfin...")
-            successful_updates, skipped_updates, failed_updates = (
-                self.rating_processor.apply_rating_updates(rating_updates)
-            )
-            
-            # Finalize unmappable ratings
-            self.rating_processor.finalize_unmappable_ratings()
-            
-            # Write comprehensive log file
-            self.write_log_file(rating_updates)
+            with ThreadPoolExecutor(max_workers=1) as file_executor:
+                # Unmappable ratings are complete once processed, so save them while updates run
+                finalize_future = file_executor.submit(self.rating_processor.finalize_unmappable_ratings)
+                
+                # Apply updates to Jellyfin
+                logger.info("Applying rating updates to Jellyfin...")
+                successful_updates, skipped_updates, failed_updates = (
+                    self.rating_processor.apply_rating_updates(rating_updates)
+                )
+                unchanged_ratings = self.rating_processor.unchanged_ratings
+                skipped_updates += len(unchanged_ratings)
+                
+                # Write comprehensive log file
+                self.write_log_file(rating_updates, unchanged_ratings)
+                finalize_future.result()
             
             # Print summary
             self._print_summary(successful_updates, skipped_updates, failed_updates, len(media_items))
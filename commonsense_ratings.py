@@ -5,25 +5,38 @@ This script fetches Common Sense Media ratings from MDBList API and updates
 Jellyfin media items using the Jellyfin Core API module.
 """
 
+import os
 import time
 import logging
-from typing import Dict, List, Optional, Generator
-from collections import defaultdict
-from dataclasses import dataclass
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Generator, Tuple
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass
 from enum import Enum
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Import the Jellyfin Core API module
-from jellyfin_core_api import (
+from jellyfin_core import (
     JellyfinAPI, MediaLibrary, MediaType, MediaItem, MediaFilter,
-    ProviderIDFilter, create_media_library, JellyfinAPIError
+    ProviderIDFilter, create_media_library, JellyfinAPIError,
+    decode_json, loads_json, dumps_json
 )
 from vars import JELLYFIN_URL, JELLYFIN_API_KEY, MDBLIST_API_KEY
 
 # Configuration
 LOG_FILE = "commonsense_ratings_log.txt"
 BATCH_SIZE = 200
-REQUEST_DELAY = 1  # seconds between API requests
+REQUEST_DELAY = 1  # seconds to back off after throttling that gives no reset time
+MDBLIST_WORKERS = 8  # MDBList batch requests in flight at once
+UPDATE_WORKERS = 16  # Jellyfin rating updates in flight at once
+MAX_PENDING_UPDATES = 50  # Jellyfin rating updates queued ahead of the workers
+PROGRESS_LOG_INTERVAL = 50  # Jellyfin rating updates between progress log records
+MDBLIST_CACHE_FILE = os.path.expanduser("~/.cache/commonsense_ratings/mdblist.json")
+MDBLIST_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+PROVIDER_PRIORITY_SET = frozenset(ProviderIDFilter.PROVIDER_PRIORITY)  # provider IDs MDBList can look up
 
 # Setup logging
 logging.basicConfig(
@@ -37,7 +50,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CommonSenseRating:
     """Container for Common Sense Media rating information"""
     commonsense: Optional[str] = None
@@ -50,10 +63,49 @@ class MDBListAPI:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.mdblist.com"
+        
+        # Shared session so batch requests reuse keep-alive connections;
+        # the batch POST is a read-only lookup, so it is safe to retry
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({'GET', 'POST'}), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=MDBLIST_WORKERS, pool_maxsize=MDBLIST_WORKERS, max_retries=retry)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # Earliest time the next request may start, taken from MDBList's rate limit headers
+        self._next_request_at = 0.0
+        self._rate_lock = threading.Lock()
+    
+    def _wait_for_rate_limit(self):
+        """Block while MDBList has reported the rate limit as exhausted"""
+        with self._rate_lock:
+            delay = self._next_request_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _update_rate_limit(self, response: requests.Response):
+        """Pause further requests until the reset time when MDBList reports no remaining quota"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        throttled = response.status_code == 429 or (remaining is not None and remaining.strip() == '0')
+        if not throttled:
+            return
+        
+        reset = response.headers.get('Retry-After') or response.headers.get('X-RateLimit-Reset')
+        try:
+            reset_value = float(reset)
+            # The reset header may be an epoch timestamp or a number of seconds
+            resume_at = reset_value if reset_value > 1e9 else time.time() + reset_value
+        except (TypeError, ValueError):
+            resume_at = time.time() + REQUEST_DELAY
+        
+        with self._rate_lock:
+            self._next_request_at = max(self._next_request_at, resume_at)
+        logger.warning(f"MDBList rate limit reached, pausing requests for {max(0.0, resume_at - time.time()):.0f}s")
     
     def get_commonsense_ratings_batch(self, provider: str, media_type: MediaType, 
-                                     ids: List[str]) -> Dict[str, CommonSenseRating]:
-        """Fetch Common Sense ratings for a batch of IDs from a specific provider"""
+                                     ids: List[str]) -> Optional[Dict[str, CommonSenseRating]]:
+        """Fetch Common Sense ratings for a batch of IDs from a specific provider, or None on failure"""
         # Map MediaType to API endpoint
         endpoint_map = {
             MediaType.MOVIE: "movie",
@@ -65,9 +117,12 @@ class MDBListAPI:
         params = {"apikey": self.api_key}
         
         try:
-            response = requests.post(url, params=params, json={"ids": ids})
+            self._wait_for_rate_limit()
+            response = self._session.post(url, params=params, data=dumps_json({"ids": ids}, indent=False),
+                                          headers={'Content-Type': 'application/json'})
+            self._update_rate_limit(response)
             response.raise_for_status()
-            data = response.json()
+            data = decode_json(response)
             
             ratings = {}
             for item in data:
@@ -82,10 +137,94 @@ class MDBListAPI:
             
             return ratings
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Failed to fetch Common Sense ratings from MDBList for {provider} {endpoint}: {e}")
             logger.error(f"Error IDs:\n{'\n'.join(ids)}")
+            return None
+
+
+class MDBListCache:
+    """Persists MDBList Common Sense lookups between runs, one entry per external ID"""
+    
+    def __init__(self, cache_file: str = MDBLIST_CACHE_FILE, ttl: float = MDBLIST_CACHE_TTL):
+        """
+        Initialize the MDBList cache.
+        
+        Args:
+            cache_file: Path of the JSON cache file
+            ttl: Maximum age of cached entries in seconds
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self._entries = self._load_all()
+    
+    @staticmethod
+    def _key(provider: str, media_type: MediaType, external_id: str) -> str:
+        """Build the cache key for a single lookup"""
+        return f"{provider}/{media_type.value}/{external_id}"
+    
+    def _load_all(self) -> Dict[str, Any]:
+        """Load every entry from the cache file"""
+        try:
+            with open(self.cache_file, 'rb') as f:
+                return loads_json(f.read())
+        except FileNotFoundError:
             return {}
+        except (ValueError, IOError) as e:
+            logger.warning(f"Failed to load MDBList cache: {e}")
+            return {}
+    
+    def lookup(self, provider: str, media_type: MediaType,
+               ids: List[str]) -> Tuple[Dict[str, CommonSenseRating], List[str]]:
+        """
+        Split IDs into fresh cached ratings and IDs that still need fetching.
+        
+        Args:
+            provider: Provider name as sent to MDBList
+            media_type: Media type of the IDs
+            ids: External IDs to look up
+            
+        Returns:
+            Tuple of (cached ratings by external ID, uncached IDs)
+        """
+        cached = {}
+        missing = []
+        expires_before = time.time() - self.ttl
+        
+        for external_id in ids:
+            entry = self._entries.get(self._key(provider, media_type, external_id))
+            if not entry or entry.get('fetched_at', 0) < expires_before:
+                missing.append(external_id)
+            elif entry.get('rating') is not None:
+                cached[external_id] = CommonSenseRating(**entry['rating'])
+        
+        return cached, missing
+    
+    def store(self, provider: str, media_type: MediaType, ids: List[str],
+              ratings: Dict[str, CommonSenseRating]) -> None:
+        """Record a fetched batch, including IDs MDBList had no rating for"""
+        fetched_at = time.time()
+        for external_id in ids:
+            rating = ratings.get(external_id)
+            self._entries[self._key(provider, media_type, external_id)] = {
+                'fetched_at': fetched_at,
+                'rating': asdict(rating) if rating else None
+            }
+    
+    def save(self) -> None:
+        """Write the cache file, dropping expired entries"""
+        expires_before = time.time() - self.ttl
+        self._entries = {
+            key: entry for key, entry in self._entries.items()
+            if entry.get('fetched_at', 0) >= expires_before
+        }
+        
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'wb') as f:
+                f.write(dumps_json(self._entries, indent=False))
+        except IOError as e:
+            logger.warning(f"Failed to save MDBList cache: {e}")
 
 
 class CommonSenseFilter(MediaFilter):
@@ -98,25 +237,27 @@ class CommonSenseFilter(MediaFilter):
     
     def should_include(self, media_item: MediaItem) -> bool:
         """Include items that have provider IDs and available Common Sense ratings"""
-        if not self.provider_filter.should_include(media_item):
-            return False
-        
         # Get the best provider ID for this item
         provider, external_id = self.provider_filter.get_best_provider_id(media_item)
-        if not external_id:
+        
+        # Check if we have rating data for this ID; most items are decided here
+        if not external_id or external_id not in self.ratings_data:
             return False
         
-        # Check if we have rating data for this ID
-        return external_id in self.ratings_data
+        return self.provider_filter.should_include(media_item)
 
 
 class CommonSenseProcessor:
     """Handles Common Sense rating processing and updates"""
     
-    def __init__(self, media_library: MediaLibrary, mdblist_api: MDBListAPI):
+    def __init__(self, media_library: MediaLibrary, mdblist_api: MDBListAPI,
+                 mdblist_cache: Optional[MDBListCache] = None):
         self.media_library = media_library
         self.mdblist_api = mdblist_api
+        self.mdblist_cache = mdblist_cache
         self.provider_filter = ProviderIDFilter()
+        # Best (provider, external_id) per media item ID, computed once per run
+        self._best_provider_ids: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
     
     @staticmethod
     def chunk_list(items: List[str], chunk_size: int) -> Generator[List[str], None, None]:
@@ -124,6 +265,13 @@ class CommonSenseProcessor:
         for i in range(0, len(items), chunk_size):
             yield items[i:i + chunk_size]
     
+    def get_best_provider_id(self, media_item: MediaItem) -> Tuple[Optional[str], Optional[str]]:
+        """Get the best provider ID for a media item, reusing earlier lookups"""
+        best = self._best_provider_ids.get(media_item.id)
+        if best is None:
+            best = self._best_provider_ids[media_item.id] = self.provider_filter.get_best_provider_id(media_item)
+        return best
+    
     def get_media_with_provider_ids(self) -> List[MediaItem]:
         """Get all movies and series that have provider IDs"""
         return self.media_library.get_movies_and_series(require_provider_ids=True)
@@ -133,7 +281,7 @@ class CommonSenseProcessor:
         grouped_data = defaultdict(lambda: defaultdict(list))
         
         for media_item in media_items:
-            provider, external_id = self.provider_filter.get_best_provider_id(media_item)
+            provider, external_id = self.get_best_provider_id(media_item)
             if provider and external_id:
                 grouped_data[provider][media_item.media_type].append(external_id)
         
@@ -144,18 +292,43 @@ class CommonSenseProcessor:
         grouped_data = self.group_media_by_provider(media_items)
         all_ratings = {}
         
+        # Process in batches to avoid API limits
+        batches = []
         for provider, media_types in grouped_data.items():
             for media_type, ids in media_types.items():
                 type_name = media_type.value.lower()
+                
+                # Serve fresh lookups from the cache and only fetch the rest
+                if self.mdblist_cache is not None:
+                    cached_ratings, ids = self.mdblist_cache.lookup(provider, media_type, ids)
+                    all_ratings.update(cached_ratings)
+                    logger.info(f"Using cached Common Sense ratings for {len(cached_ratings)} {type_name}s from {provider}")
+                
                 logger.info(f"Fetching Common Sense ratings for {len(ids)} {type_name}s from {provider}")
                 
-                # Process in batches to avoid API limits
                 for chunk in self.chunk_list(ids, BATCH_SIZE):
-                    ratings = self.mdblist_api.get_commonsense_ratings_batch(provider, media_type, chunk)
-                    all_ratings.update(ratings)
-                    
-                    if len(chunk) == BATCH_SIZE:  # Only delay if we're making multiple requests
-                        time.sleep(REQUEST_DELAY)
+                    batches.append((provider, media_type, chunk))
+        
+        with ThreadPoolExecutor(max_workers=MDBLIST_WORKERS) as executor:
+            # Pacing follows MDBList's rate limit headers inside the API client
+            futures = []
+            for provider, media_type, chunk in batches:
+                futures.append(executor.submit(
+                    self.mdblist_api.get_commonsense_ratings_batch, provider, media_type, chunk
+                ))
+            
+            # Merge in submission order so overlapping IDs resolve as they did serially
+            for (provider, media_type, chunk), future in zip(batches, futures):
+                ratings = future.result()
+                if ratings is None:
+                    continue
+                
+                all_ratings.update(ratings)
+                if self.mdblist_cache is not None:
+                    self.mdblist_cache.store(provider, media_type, chunk, ratings)
+        
+        if self.mdblist_cache is not None:
+            self.mdblist_cache.save()
         
         return all_ratings
     
@@ -170,47 +343,99 @@ class CommonSenseProcessor:
             'missing_rating_media': []
         }
         
+        user_id = self.media_library.primary_user.id
+        # Provider IDs were resolved while grouping for the MDBList fetch
+        provider_lookup = self._best_provider_ids
+        no_rating = CommonSenseRating()
+        
+        # Updates run on the Jellyfin client's shared worker pool (see main)
+        submit = self.media_library.api.submit
+        pending: deque = deque()
+        changed_entries: List[str] = []
         for media_item in media_items:
-            provider, external_id = self.provider_filter.get_best_provider_id(media_item)
+            best = provider_lookup.get(media_item.id)
+            provider, external_id = best if best is not None else self.get_best_provider_id(media_item)
             if not external_id:
                 continue
             
-            rating_info = ratings_data.get(external_id, CommonSenseRating())
+            rating_info = ratings_data.get(external_id, no_rating)
             
-            # Update Common Sense rating in Jellyfin (using custom rating field)
-            success, was_updated = self.media_library.api.update_custom_rating(
-                media_item.id, 
-                self.media_library.primary_user.id,
-                rating_info.age_rating
+            # Update Common Sense rating in Jellyfin (using custom rating field); the
+            # listing already carries the current value, so no-op updates cost no requests
+            future = submit(
+                self.media_library.api.update_media_metadata_from_item,
+                media_item,
+                user_id,
+                {"CustomRating": rating_info.age_rating}
             )
+            pending.append((future, media_item, provider, external_id, rating_info))
             
-            # Update statistics
-            if success:
-                if was_updated:
-                    stats['successful_updates'] += 1
-                else:
-                    stats['skipped_updates'] += 1
-            else:
-                stats['failed_updates'] += 1
-            
-            # Create log entry
-            update_status = self._get_update_status(success, was_updated)
-            log_entry = self._create_log_entry(
-                media_item, provider, external_id, rating_info, update_status
-            )
-            
-            # Categorize for logging
-            if rating_info.age_rating:
-                stats['rated_media'].append(log_entry)
-            else:
-                stats['missing_rating_media'].append(log_entry)
-            
-            # Log individual entries for updates or failures, not skips
-            if was_updated or not success:
-                logger.info(log_entry)
+            # Results are taken oldest first, so the log keeps library order while
+            # each collected update makes room for the next one
+            if len(pending) >= MAX_PENDING_UPDATES:
+                self._collect_update_result(stats, pending.popleft(), changed_entries)
+        
+        while pending:
+            self._collect_update_result(stats, pending.popleft(), changed_entries)
+        
+        processed = stats['successful_updates'] + stats['skipped_updates'] + stats['failed_updates']
+        if processed % PROGRESS_LOG_INTERVAL:
+            self._log_update_progress(processed, changed_entries)
         
         return stats
     
+    def _collect_update_result(self, stats: Dict[str, any], submitted: Tuple, changed_entries: List[str]):
+        """Wait for a submitted update and record it, logging progress at regular intervals"""
+        future, media_item, provider, external_id, rating_info = submitted
+        success, was_updated = future.result()
+        log_entry = self._record_update_result(
+            stats, media_item, provider, external_id, rating_info, success, was_updated
+        )
+        
+        # Log individual entries for updates or failures, not skips
+        if was_updated or not success:
+            changed_entries.append(log_entry)
+        
+        processed = stats['successful_updates'] + stats['skipped_updates'] + stats['failed_updates']
+        if processed % PROGRESS_LOG_INTERVAL == 0:
+            self._log_update_progress(processed, changed_entries)
+    
+    def _log_update_progress(self, processed: int, changed_entries: List[str]):
+        """Log the updates processed so far with the entries changed since the last record"""
+        # One record per interval rather than one handler write per item
+        if changed_entries:
+            logger.info("Processed %d Common Sense rating updates:\n%s", processed, "\n".join(changed_entries))
+            changed_entries.clear()
+        else:
+            logger.info("Processed %d Common Sense rating updates", processed)
+    
+    def _record_update_result(self, stats: Dict[str, any], media_item: MediaItem, provider: str,
+                              external_id: str, rating_info: CommonSenseRating,
+                              success: bool, was_updated: bool) -> str:
+        """Add the outcome of a single rating update to the statistics and return its log entry"""
+        # Update statistics
+        if success:
+            if was_updated:
+                stats['successful_updates'] += 1
+            else:
+                stats['skipped_updates'] += 1
+        else:
+            stats['failed_updates'] += 1
+        
+        # Create log entry
+        update_status = self._get_update_status(success, was_updated)
+        log_entry = self._create_log_entry(
+            media_item, provider, external_id, rating_info, update_status
+        )
+        
+        # Categorize for logging
+        if rating_info.age_rating:
+            stats['rated_media'].append(log_entry)
+        else:
+            stats['missing_rating_media'].append(log_entry)
+        
+        return log_entry
+    
     def _get_update_status(self, success: bool, was_updated: bool) -> str:
         """Get status string for update operation"""
         if success:
@@ -232,14 +457,17 @@ def write_log_file(stats: Dict[str, any], missing_ids_media: List[str]):
     """Write summary log file for Common Sense ratings"""
     try:
         with open(LOG_FILE, "w", encoding="utf-8") as f:
+            # Entries are streamed rather than joined into one string per section
             f.write("=== Media with Common Sense Ratings Updated ===\n")
-            f.write("\n".join(stats['rated_media']) + "\n\n")
+            f.writelines(entry + "\n" for entry in stats['rated_media'])
+            f.write("\n")
             
             f.write("=== Media with Missing Common Sense Ratings ===\n")
-            f.write("\n".join(stats['missing_rating_media']) + "\n\n")
+            f.writelines(entry + "\n" for entry in stats['missing_rating_media'])
+            f.write("\n")
             
             f.write("=== Media with No Usable External ID ===\n")
-            f.write("\n".join(missing_ids_media) + "\n")
+            f.writelines(entry + "\n" for entry in missing_ids_media)
         
         logger.info(f"Common Sense ratings log file written to: {LOG_FILE}")
     except IOError as e:
@@ -251,9 +479,9 @@ def main():
     try:
         # Initialize MediaLibrary and APIs
         logger.info("Initializing Jellyfin connection...")
-        media_library = create_media_library(JELLYFIN_URL, JELLYFIN_API_KEY)
+        media_library = create_media_library(JELLYFIN_URL, JELLYFIN_API_KEY, max_workers=UPDATE_WORKERS)
         mdblist_api = MDBListAPI(MDBLIST_API_KEY)
-        processor = CommonSenseProcessor(media_library, mdblist_api)
+        processor = CommonSenseProcessor(media_library, mdblist_api, MDBListCache())
         
         # Get all media with provider IDs
         logger.info("Fetching media from Jellyfin...")
@@ -264,12 +492,13 @@ def main():
         missing_ids_media = [
             f"{item.name} ({item.media_type.value})" 
             for item in all_media 
-            if not any(pid in item.provider_ids for pid in ProviderIDFilter.PROVIDER_PRIORITY)
+            if PROVIDER_PRIORITY_SET.isdisjoint(item.provider_ids)
         ]
         
         # Count by type for reporting
-        movies = sum(1 for m in media_with_ids if m.media_type == MediaType.MOVIE)
-        series = sum(1 for m in media_with_ids if m.media_type == MediaType.SERIES)
+        by_type = Counter(m.media_type for m in media_with_ids)
+        movies = by_type[MediaType.MOVIE]
+        series = by_type[MediaType.SERIES]
         
         logger.info(f"Found {movies} movies and {series} TV series with usable IDs")
         logger.info(f"Found {len(missing_ids_media)} items without usable IDs")
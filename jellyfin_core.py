@@ -5,13 +5,30 @@ This module provides a comprehensive interface for interacting with Jellyfin med
 handling authentication, media retrieval, and metadata updates in an object-oriented manner.
 """
 
+import json
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Any, Iterator, Union
 from dataclasses import dataclass
 from enum import Enum
 from abc import ABC, abstractmethod
 
+try:
+    import ijson
+except ImportError:  # Optional: stream_items falls back to a full parse
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # Optional: JSON encoding/decoding falls back to the json module
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -28,7 +45,73 @@ class JellyfinAPIError(Exception):
     pass
 
 
-@dataclass
+def loads_json(content: bytes) -> Any:
+    """
+    Decode a JSON document, using orjson when it is installed.
+    
+    Args:
+        content: Raw JSON bytes
+        
+    Returns:
+        The decoded JSON value
+    """
+    if orjson is None:
+        return json.loads(content)
+    return orjson.loads(content)
+
+
+def dumps_json(data: Any, indent: bool = True) -> bytes:
+    """
+    Encode a value as UTF-8 JSON, using orjson when it is installed.
+    
+    Args:
+        data: JSON-serializable value
+        indent: Pretty-print with two-space indentation
+        
+    Returns:
+        The encoded JSON bytes
+    """
+    if orjson is None:
+        if indent:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+
+
+def decode_json(response: requests.Response) -> Any:
+    """
+    Decode a JSON response body, using orjson when it is installed.
+    
+    The raw bytes are parsed directly, skipping the text decode that
+    response.json() performs first.
+    
+    Args:
+        response: Response with a JSON body
+        
+    Returns:
+        The decoded JSON value
+    """
+    return loads_json(response.content)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_str(value: str) -> Optional[str]:
+    """
+    Strip a string value, mapping blank strings to None.
+    
+    Ratings are a small vocabulary, so caching both skips the repeated strip
+    and makes equal ratings across all listed items share one string object.
+    
+    Args:
+        value: String to normalize
+        
+    Returns:
+        Stripped string or None
+    """
+    return value.strip() or None
+
+
+@dataclass(slots=True)
 class MediaItem:
     """Data class representing a media item in Jellyfin"""
     id: str
@@ -62,36 +145,72 @@ class User:
 class MediaFilter(ABC):
     """Abstract base class for media filtering"""
     
+    # Relative cost of should_include() and the fraction of items expected to pass,
+    # used by CombinedFilter to run cheap, selective filters first
+    cost: float = 1.0
+    selectivity: float = 0.5
+    
     @abstractmethod
     def should_include(self, media_item: MediaItem) -> bool:
         """Determine if media item should be included based on filter criteria"""
         pass
+    
+    def to_query_params(self) -> Dict[str, str]:
+        """
+        Get Jellyfin item query parameters that pre-filter results server-side.
+        
+        The parameters may only narrow what should_include() would accept, so
+        should_include() still runs on every returned item.
+        
+        Returns:
+            Dictionary of query parameters, empty if the filter has no equivalent
+        """
+        return {}
 
 
 class ProviderIDFilter(MediaFilter):
     """Filter media items based on available provider IDs"""
     
     PROVIDER_PRIORITY = ['Imdb', 'Tmdb', 'Trakt', 'Tvdb']
+    cost = 3.0
+    selectivity = 0.7
+    # (provider, lowercase name) pairs so lookups don't lower-case per item
+    _PROVIDER_PRIORITY_LOWER = tuple((provider, provider.lower()) for provider in PROVIDER_PRIORITY)
+    # Providers with a Has<Provider>Id item query parameter
+    _QUERYABLE_PROVIDERS = frozenset({'Imdb', 'Tmdb', 'Tvdb'})
     
     def __init__(self, required_providers: Optional[List[str]] = None):
         self.required_providers = required_providers or self.PROVIDER_PRIORITY
+        self._required_set = frozenset(self.required_providers)
     
     def should_include(self, media_item: MediaItem) -> bool:
         """Check if media item has any of the required provider IDs"""
-        return any(provider in media_item.provider_ids 
-                  for provider in self.required_providers)
+        return not self._required_set.isdisjoint(media_item.provider_ids)
+    
+    def to_query_params(self) -> Dict[str, str]:
+        """Use HasImdbId/HasTmdbId/HasTvdbId when a single queryable provider is required"""
+        # Jellyfin ANDs these parameters, so "any of several providers" has no equivalent
+        if len(self._required_set) == 1:
+            provider = next(iter(self._required_set))
+            if provider in self._QUERYABLE_PROVIDERS:
+                return {f"Has{provider}Id": "true"}
+        return {}
     
     def get_best_provider_id(self, media_item: MediaItem) -> Tuple[Optional[str], Optional[str]]:
         """Get the best available provider ID based on priority"""
-        for provider in self.PROVIDER_PRIORITY:
-            if provider in media_item.provider_ids:
-                return provider.lower(), media_item.provider_ids[provider]
+        provider_ids = media_item.provider_ids
+        for provider, provider_lower in self._PROVIDER_PRIORITY_LOWER:
+            if provider in provider_ids:
+                return provider_lower, provider_ids[provider]
         return None, None
 
 
 class RatingFilter(MediaFilter):
     """Filter media items based on rating presence"""
     
+    cost = 1.0
+    selectivity = 0.3
+    
     def __init__(self, require_official_rating: bool = False, 
                  require_custom_rating: bool = False):
         self.require_official_rating = require_official_rating
@@ -104,6 +223,12 @@ class RatingFilter(MediaFilter):
         if self.require_custom_rating and not media_item.custom_rating:
             return False
         return True
+    
+    def to_query_params(self) -> Dict[str, str]:
+        """Use HasOfficialRating for the official rating requirement"""
+        if self.require_official_rating:
+            return {"HasOfficialRating": "true"}
+        return {}
 
 
 class JellyfinAPI:
@@ -114,7 +239,10 @@ class JellyfinAPI:
     and user management with robust error handling and logging.
     """
     
-    def __init__(self, base_url: str, api_key: str, timeout: int = 30):
+    def __init__(self, base_url: str, api_key: str, timeout: int = 30,
+                 pool_size: int = 32, max_retries: int = 3,
+                 users_ttl: float = 600, ratings_ttl: float = 3600,
+                 max_workers: int = 16):
         """
         Initialize Jellyfin API client.
         
@@ -122,6 +250,11 @@ class JellyfinAPI:
             base_url: Jellyfin server URL
             api_key: API key for authentication
             timeout: Request timeout in seconds
+            pool_size: Maximum number of pooled keep-alive connections
+            max_retries: Retries for connection errors, throttling (429) and transient 5xx responses
+            users_ttl: Seconds before the cached user list is fetched again
+            ratings_ttl: Seconds before the cached parental ratings are fetched again
+            max_workers: Threads used to fan out per-item requests
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
@@ -130,12 +263,89 @@ class JellyfinAPI:
             'X-Emby-Token': api_key,
             'Content-Type': 'application/json'
         }
+        
+        # Shared session so connections are reused across calls and threads
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        # POST /Items/{id} replaces the whole item, so a repeated update is safe to retry
+        retry = Retry(total=max_retries, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({'GET', 'POST'}))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self.users_ttl = users_ttl
+        self.ratings_ttl = ratings_ttl
         self._users_cache: Optional[List[User]] = None
+        self._users_by_id: Dict[str, User] = {}
+        self._primary_user_cache: Optional[User] = None
+        self._users_cached_at = 0.0
         self._parental_ratings_cache: Optional[Dict[str, ParentalRating]] = None
+        self._parental_ratings_cached_at = 0.0
+        
+        # Created on first use and reused for every fan-out, backed by the pooled session
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    # Item fields that MediaItem carries, keyed by their Jellyfin name
+    _ITEM_FIELD_ATTRS = {"OfficialRating": "official_rating", "CustomRating": "custom_rating"}
+    
+    def close(self) -> None:
+        """Shut down the worker threads and release the session's pooled connections."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self._session.close()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the shared worker pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+    
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Run a call on the client's shared worker pool.
+        
+        The pool is sized by max_workers and its threads share the pooled
+        session, so fanning out requests through it keeps every caller within
+        one bounded set of connections.
+        
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            Future for the result of the call
+        """
+        return self._get_executor().submit(fn, *args, **kwargs)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes get their own lock and thread pool
+        state = self.__dict__.copy()
+        for name in ('_executor', '_executor_lock'):
+            del state[name]
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    def __enter__(self) -> 'JellyfinAPI':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def _make_request(self, method: str, endpoint: str, 
                      params: Optional[Dict] = None, 
-                     json_data: Optional[Dict] = None) -> requests.Response:
+                     json_data: Optional[Dict] = None,
+                     stream: bool = False,
+                     data_bytes: Optional[bytes] = None) -> requests.Response:
         """
         Make HTTP request to Jellyfin API with error handling.
         
@@ -144,6 +354,8 @@ class JellyfinAPI:
             endpoint: API endpoint
             params: Query parameters
             json_data: JSON data for request body
+            stream: Defer downloading the response body until it is read
+            data_bytes: Already-encoded JSON request body, used instead of json_data
             
         Returns:
             Response object
@@ -152,15 +364,19 @@ class JellyfinAPI:
             JellyfinAPIError: If request fails
         """
         url = f"{self.base_url}{endpoint}"
+        # The session already sends Content-Type: application/json, so the body goes out as-is
+        body = data_bytes
+        if body is None and json_data is not None:
+            body = dumps_json(json_data, indent=False)
         
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
-                headers=self.headers,
                 params=params,
-                json=json_data,
-                timeout=self.timeout
+                data=body,
+                timeout=self.timeout,
+                stream=stream
             )
             response.raise_for_status()
             return response
@@ -170,6 +386,42 @@ class JellyfinAPI:
             logger.error(error_msg)
             raise JellyfinAPIError(error_msg) from e
     
+    def stream_items(self, endpoint: str, params: Optional[Dict] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the "Items" entries of a list response one at a time.
+        
+        When ijson is installed the body is parsed incrementally as it arrives,
+        so the full response is never materialized; otherwise this falls back
+        to decode_json().
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            
+        Yields:
+            Item dictionaries from the response
+            
+        Raises:
+            JellyfinAPIError: If request or parsing fails
+        """
+        if ijson is None:
+            response = self._make_request('GET', endpoint, params=params)
+            yield from decode_json(response).get("Items", [])
+            return
+        
+        response = self._make_request('GET', endpoint, params=params, stream=True)
+        logger.debug("GET %s response size: %s bytes", endpoint, response.headers.get('Content-Length', 'unknown'))
+        try:
+            response.raw.decode_content = True
+            # use_float keeps numbers as floats, matching decode_json(), instead of Decimal
+            yield from ijson.items(response.raw, 'Items.item', use_float=True)
+        except Exception as e:
+            error_msg = f"Failed to read Jellyfin API response: GET {endpoint} - {str(e)}"
+            logger.error(error_msg)
+            raise JellyfinAPIError(error_msg) from e
+        finally:
+            response.close()
+    
     def test_connection(self) -> bool:
         """
         Test connection to Jellyfin server.
@@ -189,16 +441,20 @@ class JellyfinAPI:
         """
         Get all users from Jellyfin server.
         
+        Users are cached for users_ttl seconds. If a refresh fails, the
+        previously cached list is returned.
+        
         Args:
             refresh_cache: Force refresh of cached users
             
         Returns:
             List of User objects
         """
-        if self._users_cache is None or refresh_cache:
+        expired = time.monotonic() - self._users_cached_at >= self.users_ttl
+        if self._users_cache is None or refresh_cache or expired:
             try:
                 response = self._make_request('GET', '/Users')
-                users_data = response.json()
+                users_data = decode_json(response)
                 
                 self._users_cache = [
                     User(
@@ -208,10 +464,20 @@ class JellyfinAPI:
                     )
                     for user in users_data
                 ]
+                self._users_by_id = {user.id: user for user in self._users_cache}
+                self._primary_user_cache = next(
+                    (user for user in self._users_cache if user.is_administrator),
+                    self._users_cache[0] if self._users_cache else None
+                )
+                self._users_cached_at = time.monotonic()
                 
                 logger.info(f"Retrieved {len(self._users_cache)} users from Jellyfin")
                 
             except JellyfinAPIError:
+                # Keep serving the last good list rather than dropping every user
+                if self._users_cache is not None:
+                    logger.warning("Failed to refresh users; using the cached list")
+                    return self._users_cache
                 logger.error("Failed to retrieve users")
                 return []
         
@@ -227,28 +493,42 @@ class JellyfinAPI:
         Raises:
             JellyfinAPIError: If no users found
         """
-        users = self.get_users()
-        if not users:
+        # get_users() keeps the cached primary user in step with the user list
+        if not self.get_users():
             raise JellyfinAPIError("No users found in Jellyfin server")
-        for u in users:
-            if u.is_administrator:
-                return u
-        return users[0]
+        return self._primary_user_cache
+    
+    def get_user(self, user_id: str) -> Optional[User]:
+        """
+        Get a user by ID from the cached user list.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            User object or None if not found
+        """
+        self.get_users()
+        return self._users_by_id.get(user_id)
     
     def get_parental_ratings(self, refresh_cache: bool = False) -> Dict[str, ParentalRating]:
         """
         Get parental rating mappings from Jellyfin.
         
+        Ratings are cached for ratings_ttl seconds. If a refresh fails, the
+        previously cached ratings are returned.
+        
         Args:
             refresh_cache: Force refresh of cached ratings
             
         Returns:
             Dictionary mapping rating names to ParentalRating objects
         """
-        if self._parental_ratings_cache is None or refresh_cache:
+        expired = time.monotonic() - self._parental_ratings_cached_at >= self.ratings_ttl
+        if self._parental_ratings_cache is None or refresh_cache or expired:
             try:
                 response = self._make_request('GET', '/Localization/ParentalRatings')
-                ratings_data = response.json()
+                ratings_data = decode_json(response)
                 
                 self._parental_ratings_cache = {
                     rating.get("Name", ""): ParentalRating(
@@ -258,18 +538,33 @@ class JellyfinAPI:
                     for rating in ratings_data
                     if rating.get("Name")
                 }
+                self._parental_ratings_cached_at = time.monotonic()
                 
                 logger.info(f"Retrieved {len(self._parental_ratings_cache)} parental ratings")
                 
             except JellyfinAPIError:
+                if self._parental_ratings_cache is not None:
+                    logger.warning("Failed to refresh parental ratings; using the cached ratings")
+                    return self._parental_ratings_cache
                 logger.error("Failed to retrieve parental ratings")
                 return {}
         
         return self._parental_ratings_cache or {}
     
+    def invalidate_users(self) -> None:
+        """Drop the cached user list so the next get_users() call fetches it again."""
+        self._users_cache = None
+        self._users_by_id = {}
+        self._primary_user_cache = None
+    
+    def invalidate_parental_ratings(self) -> None:
+        """Drop the cached parental ratings so the next get_parental_ratings() call fetches them again."""
+        self._parental_ratings_cache = None
+    
     def get_media_items(self, user_id: str, media_types: List[MediaType],
                        media_filter: Optional[MediaFilter] = None,
-                       fields: Optional[List[str]] = None) -> List[MediaItem]:
+                       fields: Optional[List[str]] = None,
+                       extra_params: Optional[Dict[str, str]] = None) -> List[MediaItem]:
         """
         Get media items from Jellyfin with optional filtering.
         
@@ -278,50 +573,108 @@ class JellyfinAPI:
             media_types: List of media types to retrieve
             media_filter: Optional filter to apply to results
             fields: Additional fields to retrieve
+            extra_params: Additional item query parameters, e.g. from MediaFilter.to_query_params()
             
         Returns:
             List of MediaItem objects
         """
-        all_media = []
         default_fields = ["ProviderIds", "OfficialRating", "CustomRating"]
-        request_fields = list(set(default_fields + (fields or [])))
+        # Joined once and sorted so the query string is identical on every run
+        fields_param = ",".join(sorted(set(default_fields + (fields or []))))
         
-        for media_type in media_types:
-            logger.info(f"Fetching {media_type.value.lower()}s...")
+        # One recursive query covers every requested type; items are bucketed by
+        # their Type so results keep the per-type order of media_types
+        media_by_type = {media_type: [] for media_type in media_types}
+        type_names = " and ".join(f"{media_type.value.lower()}s" for media_type in media_types)
+        logger.info(f"Fetching {type_names}...")
+        
+        try:
+            self._collect_media_items(user_id, media_types, fields_param, media_filter, media_by_type,
+                                      extra_params)
             
-            params = {
-                "IncludeItemTypes": media_type.value,
-                "Recursive": "true",
-                "Fields": ",".join(request_fields)
-            }
+        except JellyfinAPIError:
+            if len(media_types) < 2:
+                logger.error(f"Failed to retrieve {type_names}")
+                return []
             
-            try:
-                response = self._make_request('GET', f'/Users/{user_id}/Items', params=params)
-                items_data = response.json().get("Items", [])
+            # Older servers may reject a combined IncludeItemTypes, and any other failure
+            # should only cost the type that fails, so query each type instead. A response
+            # that failed part-way contributes nothing
+            logger.warning("Combined item type query failed, fetching each type separately")
+            for media_type in media_types:
+                media_by_type[media_type] = []
                 
-                for item_data in items_data:
-                    media_item = MediaItem(
-                        id=item_data["Id"],
-                        name=item_data.get("Name", "Unknown"),
-                        media_type=media_type,
-                        provider_ids=item_data.get("ProviderIds", {}),
-                        official_rating=self._normalize_value(item_data.get("OfficialRating")),
-                        custom_rating=self._normalize_value(item_data.get("CustomRating"))
-                    )
-                    
-                    # Apply filter if provided
-                    if media_filter is None or media_filter.should_include(media_item):
-                        all_media.append(media_item)
-                
-                logger.info(f"Retrieved {len([m for m in all_media if m.media_type == media_type])} "
-                           f"{media_type.value.lower()}s")
-                
-            except JellyfinAPIError:
-                logger.error(f"Failed to retrieve {media_type.value.lower()}s")
-                continue
+                try:
+                    self._collect_media_items(user_id, [media_type], fields_param, media_filter, media_by_type,
+                                              extra_params)
+                except JellyfinAPIError:
+                    media_by_type[media_type] = []
+                    logger.error(f"Failed to retrieve {media_type.value.lower()}s")
+        
+        all_media = []
+        for media_type in media_types:
+            all_media.extend(media_by_type[media_type])
+        logger.info("Retrieved " + " and ".join(
+            f"{len(media_by_type[media_type])} {media_type.value.lower()}s" for media_type in media_types
+        ))
         
         return all_media
     
+    def _collect_media_items(self, user_id: str, media_types: List[MediaType], fields_param: str,
+                             media_filter: Optional[MediaFilter],
+                             media_by_type: Dict[MediaType, List[MediaItem]],
+                             extra_params: Optional[Dict[str, str]] = None) -> None:
+        """
+        Stream one item query for the given types into per-type buckets.
+        
+        Args:
+            user_id: User ID for context
+            media_types: Media types to include in the query
+            fields_param: Comma-separated fields to retrieve
+            media_filter: Optional filter to apply to results
+            media_by_type: Buckets that matching MediaItems are appended to
+            extra_params: Additional item query parameters
+            
+        Raises:
+            JellyfinAPIError: If the request fails
+        """
+        # Jellyfin's Type strings match most enum values exactly; case-insensitive matching is the fallback
+        types_by_name = {media_type.value: media_type for media_type in media_types}
+        types_by_lower = {media_type.value.lower(): media_type for media_type in media_types}
+        params = {
+            "IncludeItemTypes": ",".join(media_type.value for media_type in media_types),
+            "Recursive": "true",
+            "Fields": fields_param,
+            # Fields is the allowlist; drop the image and user-data envelope sent by default
+            "EnableImages": "false",
+            "EnableImageTypes": "",
+            "EnableUserData": "false",
+            "EnableTotalRecordCount": "false",
+            **(extra_params or {})
+        }
+        
+        # Items are parsed as they stream in; only matching MediaItems are kept
+        for item_data in self.stream_items(f'/Users/{user_id}/Items', params=params):
+            type_name = item_data.get("Type")
+            media_type = types_by_name.get(type_name)
+            if media_type is None:
+                media_type = types_by_lower.get(str(type_name or "").lower())
+                if media_type is None:
+                    continue
+            
+            media_item = MediaItem(
+                id=item_data["Id"],
+                name=item_data.get("Name", "Unknown"),
+                media_type=media_type,
+                provider_ids=item_data.get("ProviderIds", {}),
+                official_rating=self._normalize_value(item_data.get("OfficialRating")),
+                custom_rating=self._normalize_value(item_data.get("CustomRating"))
+            )
+            
+            # Apply filter if provided
+            if media_filter is None or media_filter.should_include(media_item):
+                media_by_type[media_type].append(media_item)
+    
     def get_media_item_details(self, item_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed information for a specific media item.
@@ -336,9 +689,9 @@ class JellyfinAPI:
         try:
             response = self._make_request('GET', f'/Items/{item_id}', 
                                         params={"userId": user_id})
-            return response.json()
+            return decode_json(response)
         except JellyfinAPIError:
-            logger.error(f"Failed to get details for item {item_id}")
+            logger.error("Failed to get details for item %s", item_id)
             return None
     
     def update_media_metadata(self, item_id: str, user_id: str, 
@@ -355,33 +708,53 @@ class JellyfinAPI:
             Tuple of (success, was_updated)
         """
         try:
-            # Get current metadata
+            # POST /Items/{id} replaces the whole item, so start from the full current metadata
             current_data = self.get_media_item_details(item_id, user_id)
             if not current_data:
                 return False, False
             
-            # Check if any updates are needed
-            changes_needed = False
-            for field, new_value in updates.items():
-                current_value = self._normalize_value(current_data.get(field))
-                new_value_normalized = self._normalize_value(new_value)
-                
-                if current_value != new_value_normalized:
-                    current_data[field] = new_value
-                    changes_needed = True
-            
-            if not changes_needed:
+            # Work out the real changes before touching the payload
+            changes = {
+                field: new_value for field, new_value in updates.items()
+                if self._normalize_value(current_data.get(field)) != self._normalize_value(new_value)
+            }
+            if not changes:
                 return True, False
             
             # Apply updates
-            self._make_request('POST', f'/Items/{item_id}', json_data=current_data)
-            logger.debug(f"Updated metadata for item {item_id}: {updates}")
+            current_data.update(changes)
+            self._make_request('POST', f'/Items/{item_id}', data_bytes=dumps_json(current_data, indent=False))
+            logger.debug("Updated metadata for item %s: %s", item_id, changes)
             return True, True
             
         except JellyfinAPIError:
-            logger.error(f"Failed to update metadata for item {item_id}")
+            logger.error("Failed to update metadata for item %s", item_id)
             return False, False
     
+    def update_media_metadata_from_item(self, media_item: MediaItem, user_id: str,
+                                        updates: Dict[str, Any]) -> Tuple[bool, bool]:
+        """
+        Update metadata for an already-fetched media item.
+        
+        Fields the MediaItem carries are compared in memory first, so an update
+        that changes nothing costs no requests. Otherwise this falls back to
+        update_media_metadata, which still needs the full item to POST back.
+        
+        Args:
+            media_item: Media item as returned by get_media_items
+            user_id: User ID for context
+            updates: Dictionary of field updates
+            
+        Returns:
+            Tuple of (success, was_updated)
+        """
+        for field, new_value in updates.items():
+            attr = self._ITEM_FIELD_ATTRS.get(field)
+            if attr is None or getattr(media_item, attr) != self._normalize_value(new_value):
+                return self.update_media_metadata(media_item.id, user_id, updates)
+        
+        return True, False
+    
     def update_official_rating(self, item_id: str, user_id: str, 
                              rating: Optional[str]) -> Tuple[bool, bool]:
         """
@@ -425,6 +798,8 @@ class JellyfinAPI:
         """
         if value is None:
             return None
+        if isinstance(value, str):
+            return _normalize_str(value)
         normalized = str(value).strip()
         return normalized if normalized else None
     
@@ -437,7 +812,7 @@ class JellyfinAPI:
         """
         try:
             response = self._make_request('GET', '/System/Info')
-            return response.json()
+            return decode_json(response)
         except JellyfinAPIError:
             return None
 
@@ -496,16 +871,22 @@ class MediaLibrary:
         return self.api.get_media_items(
             user_id=self.primary_user.id,
             media_types=media_types,
-            media_filter=combined_filter
+            media_filter=combined_filter,
+            extra_params=combined_filter.to_query_params() if combined_filter else None
         )
     
-    def bulk_update_ratings(self, updates: List[Tuple[str, str, str]], 
+    def bulk_update_ratings(self, updates: List[Tuple[Union[str, MediaItem], str, str]], 
                           rating_type: str = "official") -> Tuple[int, int, int]:
         """
         Perform bulk rating updates.
         
+        Updates are independent, so they run concurrently on the API's shared
+        worker pool (sized by its max_workers); results are tallied and logged
+        in the order of ``updates``. Passing the MediaItem instead of its ID
+        lets unchanged ratings be skipped without any requests.
+        
         Args:
-            updates: List of (item_id, old_rating, new_rating) tuples
+            updates: List of (item or item_id, old_rating, new_rating) tuples
             rating_type: Type of rating to update ("official" or "custom")
             
         Returns:
@@ -517,26 +898,37 @@ class MediaLibrary:
         
         update_method = (self.api.update_official_rating if rating_type == "official" 
                         else self.api.update_custom_rating)
+        field = "OfficialRating" if rating_type == "official" else "CustomRating"
+        
+        user_id = self.primary_user.id
+        
+        submit = self.api.submit
+        futures = [
+            submit(self.api.update_media_metadata_from_item, item, user_id, {field: new_rating})
+            if isinstance(item, MediaItem) else
+            submit(update_method, item, user_id, new_rating)
+            for item, _, new_rating in updates
+        ]
         
-        for item_id, old_rating, new_rating in updates:
+        for (item, old_rating, new_rating), future in zip(updates, futures):
+            item_id = item.id if isinstance(item, MediaItem) else item
             try:
-                success, was_updated = update_method(
-                    item_id, self.primary_user.id, new_rating
-                )
+                success, was_updated = future.result()
                 
                 if success:
                     if was_updated:
                         successful += 1
-                        logger.info(f"Updated {rating_type} rating: {old_rating} -> {new_rating}")
+                        logger.debug("Updated %s rating: %s -> %s", rating_type, old_rating, new_rating)
                     else:
                         skipped += 1
                 else:
                     failed += 1
                     
             except Exception as e:
-                logger.error(f"Failed to update rating for item {item_id}: {e}")
+                logger.error("Failed to update rating for item %s: %s", item_id, e)
                 failed += 1
         
+        logger.info(f"Updated {successful} {rating_type} ratings ({skipped} unchanged, {failed} failed)")
         return successful, skipped, failed
 
 
@@ -545,20 +937,38 @@ class CombinedFilter(MediaFilter):
     
     def __init__(self, filters: List[MediaFilter]):
         self.filters = filters
+        # Bound predicates resolved once, ordered so the likeliest cheap rejection runs first
+        ordered = sorted(filters, key=lambda f: f.cost / max(1.0 - f.selectivity, 1e-3))
+        self._predicates = tuple(filter.should_include for filter in ordered)
     
     def should_include(self, media_item: MediaItem) -> bool:
         """Item must pass all filters"""
-        return all(filter.should_include(media_item) for filter in self.filters)
+        for predicate in self._predicates:
+            if not predicate(media_item):
+                return False
+        return True
+    
+    def to_query_params(self) -> Dict[str, str]:
+        """Merge the parameters of every filter, which Jellyfin also combines with AND"""
+        params = {}
+        for filter in self.filters:
+            params.update(filter.to_query_params())
+        return params
 
 
 # Utility functions for common operations
-def create_jellyfin_client(base_url: str, api_key: str) -> JellyfinAPI:
+def create_jellyfin_client(base_url: str, api_key: str, pool_size: int = 32,
+                           max_workers: int = 16) -> JellyfinAPI:
     """
     Create and test a JellyfinAPI client.
     
+    The client can be used as a context manager to close its connection pool.
+    
     Args:
         base_url: Jellyfin server URL
         api_key: API key for authentication
+        pool_size: Maximum number of pooled keep-alive connections
+        max_workers: Threads in the client's shared worker pool
         
     Returns:
         Configured JellyfinAPI instance
@@ -566,24 +976,28 @@ def create_jellyfin_client(base_url: str, api_key: str) -> JellyfinAPI:
     Raises:
         JellyfinAPIError: If connection test fails
     """
-    client = JellyfinAPI(base_url, api_key)
+    client = JellyfinAPI(base_url, api_key, pool_size=pool_size, max_workers=max_workers)
     
     if not client.test_connection():
+        client.close()
         raise JellyfinAPIError("Failed to establish connection to Jellyfin server")
     
     return client
 
 
-def create_media_library(base_url: str, api_key: str) -> MediaLibrary:
+def create_media_library(base_url: str, api_key: str, pool_size: int = 32,
+                         max_workers: int = 16) -> MediaLibrary:
     """
     Create a MediaLibrary instance with tested connection.
     
     Args:
         base_url: Jellyfin server URL
         api_key: API key for authentication
+        pool_size: Maximum number of pooled keep-alive connections
+        max_workers: Threads in the client's shared worker pool
         
     Returns:
         MediaLibrary instance
     """
-    api = create_jellyfin_client(base_url, api_key)
+    api = create_jellyfin_client(base_url, api_key, pool_size=pool_size, max_workers=max_workers)
     return MediaLibrary(api)
\ No newline at end of file
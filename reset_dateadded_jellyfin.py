@@ -242,8 +242,12 @@ class JellyfinDateAddedUpdater:
         self.radarr_api = RadarrAPI(radarr_url, radarr_api_key)
         self.movie_cache = RadarrMovieCache(self.radarr_api)
         
-        # Cache for Jellyfin movies (loaded once and reused)
+        # Cache for Jellyfin movies (loaded once and reused) and lookup indexes built from it
         self._jellyfin_movies: Optional[List[Any]] = None
+        self._jellyfin_by_tmdb: Dict[str, Any] = {}
+        self._jellyfin_by_imdb: Dict[str, Any] = {}
+        self._jellyfin_by_lower_name: Dict[str, Any] = {}
+        self._jellyfin_titles: List[Tuple[str, Optional[int], Any]] = []
         
         try:
             self.jellyfin_library = create_media_library(jellyfin_url, jellyfin_api_key)
@@ -261,19 +265,40 @@ class JellyfinDateAddedUpdater:
         
         # Load Jellyfin movies once and cache them
         logger.info("Loading Jellyfin movies...")
+        self._load_jellyfin_movies()
+        
+        logger.info("Cache updated successfully")
+    
+    def _load_jellyfin_movies(self) -> None:
+        """Fetch Jellyfin movies and build the lookup indexes used by find_jellyfin_movie."""
         all_media = self.jellyfin_library.get_movies_and_series()
         self._jellyfin_movies = [m for m in all_media if m.media_type == MediaType.MOVIE]
-        logger.info(f"Cached {len(self._jellyfin_movies)} movies from Jellyfin")
         
-        logger.info("Cache updated successfully")
+        # setdefault keeps the first movie per key, matching the order the old scans returned
+        self._jellyfin_by_tmdb = {}
+        self._jellyfin_by_imdb = {}
+        self._jellyfin_by_lower_name = {}
+        self._jellyfin_titles = []
+        for movie in self._jellyfin_movies:
+            tmdb_id = movie.provider_ids.get('Tmdb')
+            if tmdb_id:
+                self._jellyfin_by_tmdb.setdefault(tmdb_id, movie)
+            imdb_id = movie.provider_ids.get('Imdb')
+            if imdb_id:
+                self._jellyfin_by_imdb.setdefault(imdb_id, movie)
+            self._jellyfin_by_lower_name.setdefault(movie.name.lower(), movie)
+            
+            # Titles are normalized once here instead of on every directory
+            clean_title, movie_year = extract_year_from_title(movie.name)
+            self._jellyfin_titles.append((RadarrMovieCache._normalize_title(clean_title), movie_year, movie))
+        
+        logger.info(f"Cached {len(self._jellyfin_movies)} movies from Jellyfin")
     
     def get_jellyfin_movies(self) -> List[Any]:
         """Get cached Jellyfin movies, loading them if not already cached."""
         if self._jellyfin_movies is None:
             logger.info("Loading Jellyfin movies for the first time...")
-            all_media = self.jellyfin_library.get_movies_and_series()
-            self._jellyfin_movies = [m for m in all_media if m.media_type == MediaType.MOVIE]
-            logger.info(f"Cached {len(self._jellyfin_movies)} movies from Jellyfin")
+            self._load_jellyfin_movies()
         
         return self._jellyfin_movies
     
@@ -318,23 +343,23 @@ class JellyfinDateAddedUpdater:
         Returns:
             Jellyfin MediaItem or None
         """
-        jellyfin_movies = self.get_jellyfin_movies()
+        self.get_jellyfin_movies()
         
         # Strategy 1: Match by TMDB ID
         radarr_tmdb_id = str(radarr_movie.get('tmdbId', ''))
         if radarr_tmdb_id:
-            for movie in jellyfin_movies:
-                if movie.provider_ids.get('Tmdb') == radarr_tmdb_id:
-                    logger.debug(f"Matched by TMDB ID: {movie.name}")
-                    return movie
+            movie = self._jellyfin_by_tmdb.get(radarr_tmdb_id)
+            if movie:
+                logger.debug(f"Matched by TMDB ID: {movie.name}")
+                return movie
         
         # Strategy 2: Match by IMDB ID
         radarr_imdb_id = radarr_movie.get('imdbId', '')
         if radarr_imdb_id:
-            for movie in jellyfin_movies:
-                if movie.provider_ids.get('Imdb') == radarr_imdb_id:
-                    logger.debug(f"Matched by IMDB ID: {movie.name}")
-                    return movie
+            movie = self._jellyfin_by_imdb.get(radarr_imdb_id)
+            if movie:
+                logger.debug(f"Matched by IMDB ID: {movie.name}")
+                return movie
         
         # Strategy 3: Match by title and year
         radarr_title = radarr_movie.get('title', '')
@@ -343,11 +368,7 @@ class JellyfinDateAddedUpdater:
         if radarr_title:
             normalized_radarr_title = RadarrMovieCache._normalize_title(radarr_title)
             
-            for movie in jellyfin_movies:
-                # Extract year from Jellyfin movie name if present
-                clean_title, movie_year = extract_year_from_title(movie.name)
-                normalized_movie_title = RadarrMovieCache._normalize_title(clean_title)
-                
+            for normalized_movie_title, movie_year, movie in self._jellyfin_titles:
                 # Check title match
                 title_match = (normalized_radarr_title == normalized_movie_title or
                              normalized_radarr_title in normalized_movie_title or
@@ -362,10 +383,14 @@ class JellyfinDateAddedUpdater:
                     logger.debug(f"Matched by title/year: {movie.name}")
                     return movie
         
-        # Strategy 4: Match by folder name (fallback)
+        # Strategy 4: Match by folder name (fallback), exact name first
         folder_name_lower = folder_name.lower()
-        for movie in jellyfin_movies:
-            if folder_name_lower in movie.name.lower() or movie.name.lower() in folder_name_lower:
+        movie = self._jellyfin_by_lower_name.get(folder_name_lower)
+        if movie:
+            logger.debug(f"Matched by folder name: {movie.name}")
+            return movie
+        for movie_name_lower, movie in self._jellyfin_by_lower_name.items():
+            if folder_name_lower in movie_name_lower or movie_name_lower in folder_name_lower:
                 logger.debug(f"Matched by folder name: {movie.name}")
                 return movie
         